@@ -3,7 +3,10 @@ Athome Property Scraper 設定ファイル
 大分市売土地情報収集システムの設定
 """
 import os
+from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, FrozenSet, Mapping, Tuple
 
 # プロジェクトのベースディレクトリ
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -23,6 +26,10 @@ SCRAPING_CONFIG = {
     "max_retries": 3,  # 最大リトライ回数
     "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "max_pages": 10,  # 最大取得ページ数（None = 全ページ）
+    "max_workers": 4,  # 物件詳細の並列取得数（リクエスト間隔は全体で共有）
+    "html_parser": "lexbor",  # 物件詳細の解析: "lexbor"（selectolax）または "lxml"（BeautifulSoup）
+    "recrawl_ttl_hours": 24,  # この時間内に取得済みの物件は詳細を再取得しない（Selenium版、0 = 常に取得）
+    "headless": True,  # Selenium版をヘッドレスで実行（CAPTCHA検出時のみ画面表示ありに切り替え）
 }
 
 # ===========================================
@@ -32,6 +39,7 @@ SCRAPING_CONFIG = {
 DATABASE_CONFIG = {
     "db_path": BASE_DIR / "data" / "properties.db",
     "backup_dir": BASE_DIR / "data" / "backups",
+    "batch_size": 50,  # 1トランザクションでまとめて保存する物件数
 }
 
 # ===========================================
@@ -65,11 +73,11 @@ PRICE_CRITERIA = {
 }
 
 # 立地評価（優良エリア）
-PREMIUM_AREAS = [
+PREMIUM_AREAS = frozenset([
     "中央町", "府内町", "都町", "金池町", "末広町",
     "千代町", "大手町", "荷揚町", "長浜町", "錦町",
     "城崎町", "東大道", "西大道", "大道町", "萩原"
-]
+])
 
 # 駅距離評価基準（徒歩分）
 STATION_DISTANCE_CRITERIA = {
@@ -105,6 +113,25 @@ INVESTMENT_CRITERIA = {
     }
 }
 
+# 評価テーブル（上記の基準から起動時に1度だけ生成）
+# 各要素は (閾値, 点数)。価格・駅距離は「以下」判定のため閾値の昇順、
+# 面積・投資価値は「以上」判定のため閾値の降順に並べる
+CRITERIA_SCORES = {"excellent": 100, "very_good": 80, "good": 60, "fair": 40, "poor": 20}
+PRICE_CRITERIA_SORTED = sorted(
+    (PRICE_CRITERIA[grade], score) for grade, score in CRITERIA_SCORES.items()
+)
+STATION_DISTANCE_CRITERIA_SORTED = sorted(
+    (STATION_DISTANCE_CRITERIA[grade], score) for grade, score in CRITERIA_SCORES.items()
+)
+AREA_CRITERIA_SORTED = sorted(
+    ((AREA_CRITERIA[grade], score) for grade, score in CRITERIA_SCORES.items()),
+    reverse=True
+)
+INVESTMENT_CRITERIA_SORTED = {
+    key: sorted(criteria.items(), reverse=True)
+    for key, criteria in INVESTMENT_CRITERIA.items()
+}
+
 # ===========================================
 # 通知設定
 # ===========================================
@@ -162,4 +189,51 @@ SAMPLE_DATA_FILE = BASE_DIR / "tests" / "sample_data.json"  # テスト用サン
 SCHEDULE_CONFIG = {
     "cron_expression": "0 9,12,15,17 * * *",  # 毎日9時、12時、15時、17時に実行
     "timezone": "Asia/Tokyo",
-}
\ No newline at end of file
+}
+
+# ===========================================
+# 設定オブジェクト
+# ===========================================
+
+@dataclass(frozen=True)
+class ScraperConfig:
+    """スクレイパーとランカーに渡す設定（読み取り専用）"""
+    base_url: str
+    search_url: str
+    scraping: Mapping[str, Any]
+    database: Mapping[str, Any]
+    rank_thresholds: Mapping[str, float]
+    ranking_weights: Mapping[str, float]
+    price_criteria: Mapping[str, float]
+    premium_areas: FrozenSet[str]
+    station_distance_criteria: Mapping[str, float]
+    area_criteria: Mapping[str, float]
+    investment_criteria: Mapping[str, Mapping[float, float]]
+    price_criteria_sorted: Tuple[Tuple[float, int], ...]
+    station_distance_criteria_sorted: Tuple[Tuple[float, int], ...]
+    area_criteria_sorted: Tuple[Tuple[float, int], ...]
+    investment_criteria_sorted: Mapping[str, Tuple[Tuple[float, float], ...]]
+
+
+# 起動時に1度だけ生成する設定インスタンス
+CONFIG = ScraperConfig(
+    base_url=ATHOME_BASE_URL,
+    search_url=ATHOME_SEARCH_URL,
+    scraping=MappingProxyType(SCRAPING_CONFIG),
+    database=MappingProxyType(DATABASE_CONFIG),
+    rank_thresholds=MappingProxyType(RANK_THRESHOLDS),
+    ranking_weights=MappingProxyType(RANKING_WEIGHTS),
+    price_criteria=MappingProxyType(PRICE_CRITERIA),
+    premium_areas=PREMIUM_AREAS,
+    station_distance_criteria=MappingProxyType(STATION_DISTANCE_CRITERIA),
+    area_criteria=MappingProxyType(AREA_CRITERIA),
+    investment_criteria=MappingProxyType({
+        key: MappingProxyType(criteria) for key, criteria in INVESTMENT_CRITERIA.items()
+    }),
+    price_criteria_sorted=tuple(PRICE_CRITERIA_SORTED),
+    station_distance_criteria_sorted=tuple(STATION_DISTANCE_CRITERIA_SORTED),
+    area_criteria_sorted=tuple(AREA_CRITERIA_SORTED),
+    investment_criteria_sorted=MappingProxyType({
+        key: tuple(ladder) for key, ladder in INVESTMENT_CRITERIA_SORTED.items()
+    }),
+)
@@ -50,23 +50,8 @@ def run_scraping():
     logger.info("="*60)
     
     try:
-        # 設定を辞書化
-        config = {
-            'ATHOME_BASE_URL': ATHOME_BASE_URL,
-            'ATHOME_SEARCH_URL': ATHOME_SEARCH_URL,
-            'SCRAPING_CONFIG': SCRAPING_CONFIG,
-            'DATABASE_CONFIG': DATABASE_CONFIG,
-            'RANK_THRESHOLDS': RANK_THRESHOLDS,
-            'RANKING_WEIGHTS': RANKING_WEIGHTS,
-            'PRICE_CRITERIA': PRICE_CRITERIA,
-            'PREMIUM_AREAS': PREMIUM_AREAS,
-            'STATION_DISTANCE_CRITERIA': STATION_DISTANCE_CRITERIA,
-            'AREA_CRITERIA': AREA_CRITERIA,
-            'INVESTMENT_CRITERIA': INVESTMENT_CRITERIA,
-        }
-        
         # Seleniumスクレイパーを実行
-        scraper = SeleniumAthomeScraper(config)
+        scraper = SeleniumAthomeScraper(CONFIG)
         stats = scraper.scrape_all()
         
         # 結果サマリーを表示
@@ -84,7 +69,9 @@ def run_scraping():
         
         # 高ランク物件を表示
         db = PropertyDatabase(DATABASE_CONFIG['db_path'])
-        high_rank_properties = db.get_active_properties(['S', 'A'])
+        high_rank_properties = db.get_active_properties(
+            ['S', 'A'], columns=['ranking_grade', 'ranking_score', 'title', 'price', 'address']
+        )
         
         if high_rank_properties:
             logger.info("\n" + "="*60)
@@ -106,6 +93,8 @@ def run_scraping():
             db.export_to_csv(csv_file, rank_filter=['S', 'A', 'B'])
             logger.info(f"\nCSVファイルを出力しました: {csv_file}")
         
+        db.close()
+        
         logger.info("\n" + "="*60)
         logger.info("スクレイピング正常終了")
         logger.info("="*60)
@@ -122,6 +111,7 @@ def show_status():
     try:
         db = PropertyDatabase(DATABASE_CONFIG['db_path'])
         stats = db.get_statistics()
+        db.close()
         
         print("\n" + "="*60)
         print("📊 Athome Property Scraper ステータス")
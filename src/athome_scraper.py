@@ -5,47 +5,199 @@ Athome Property Scraper メインモジュール
 import re
 import time
 import json
+import hashlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
 import requests
+import soupsieve as sv
 from bs4 import BeautifulSoup
+from urllib3.util import make_headers
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # selectolax未導入時はBeautifulSoup + lxmlで解析
+    LexborHTMLParser = None
 
 from .database import PropertyDatabase
 from .ranking import PropertyRanker
+from .property_id import extract_property_id
+from .rate_limiter import RateLimiter
+from .batch_saver import BatchSaver, fetch_and_save
+
+if TYPE_CHECKING:
+    from config.athome_scraper_config import ScraperConfig
 
 logger = logging.getLogger(__name__)
 
+# 物件詳細の抽出パターン（呼び出し側でアンカー文字列の有無を先に確認する）
+_RE_PRICE = re.compile(r'([\d,]+)\s*万円')
+_RE_M2 = re.compile(r'([\d,]+\.?\d*)\s*(?:m2|㎡)')
+_RE_TSUBO = re.compile(r'([\d,]+\.?\d*)\s*坪')
+_RE_WALK = re.compile(r'徒歩\s*(\d+)\s*分')
+_RE_PCT = re.compile(r'(\d+)\s*[%％]')
+
+# 一覧ページのセレクタ（サイト構造に応じて調整必要）
+_SEL_LISTING_LINKS = sv.compile('a.property-link, .bukken-link a, .item-link')
+_SEL_LISTING_LINKS_FALLBACK = sv.compile(
+    '[class*="property"] a[href*="/detail/"], [class*="bukken"] a[href*="/detail/"]'
+)
+_SEL_NEXT_PAGE = sv.compile('a.next-page, .pagination .next a, [class*="next"]')
+
+# 物件詳細ページの項目ごとのクラス名（完全一致、.property-title 等のセレクタに相当）
+_FIELD_CLASSES = {
+    'title': ('property-title', 'bukken-title'),
+    'price': ('kakaku',),
+    'address': ('jusho',),
+}
+# 物件詳細ページの項目ごとのクラス名キーワード（部分一致、[class*="price"] 等のセレクタに相当）
+_FIELD_CLASS_TOKENS = {
+    'title': (),
+    'price': ('price',),
+    'address': ('address',),
+    'area': ('area', 'menseki'),
+    'station': ('station', 'eki'),
+    'coverage': ('kenpei',),
+    'ratio': ('yoseki',),
+    'usage': ('youto', 'chiiki'),
+}
+# クラス名に関係なく項目とみなすタグ
+_FIELD_TAGS = {'h1': 'title'}
+
+_IMAGE_SELECTOR = '.property-image img, .bukken-image img, [class*="photo"] img'
+_SEL_IMAGES = sv.compile(_IMAGE_SELECTOR)
+
+# 物件詳細ページから取得する項目（304応答時にDBのキャッシュから復元）
+_DETAIL_FIELDS = (
+    'property_id', 'url', 'title', 'price', 'price_numeric', 'address',
+    'land_area', 'land_area_m2', 'land_area_tsubo', 'nearest_station',
+    'walk_time', 'walk_minutes', 'building_coverage', 'floor_area_ratio',
+    'usage_area', 'image_urls', 'raw_data', 'etag', 'last_modified', 'content_hash'
+)
+
+
+def _has_percent(text: str) -> bool:
+    """パーセント記号（半角・全角）を含むか"""
+    return '%' in text or '％' in text
+
+
+def _match_fields(tag: str, class_text: str, texts: Dict[str, str]) -> List[str]:
+    """
+    要素が該当する未取得の項目名を返す
+    
+    Args:
+        tag: タグ名
+        class_text: class属性の値
+        texts: 取得済みの項目
+    
+    Returns:
+        該当する項目名のリスト
+    """
+    tag_field = _FIELD_TAGS.get(tag)
+    if not class_text and not tag_field:
+        return []
+    
+    classes = class_text.split()
+    return [
+        field for field, tokens in _FIELD_CLASS_TOKENS.items()
+        if field not in texts
+        and (field == tag_field
+             or any(name in classes for name in _FIELD_CLASSES.get(field, ()))
+             or any(token in class_text for token in tokens))
+    ]
+
+
+def _extract_field_texts(soup: BeautifulSoup) -> Dict[str, str]:
+    """
+    DOMを1回だけ走査して各項目のテキストを抽出
+    
+    項目ごとに文書順で最初に一致した要素を採用する
+    
+    Args:
+        soup: 物件詳細ページ
+    
+    Returns:
+        項目名とテキストの辞書（見つからない項目は含まない）
+    """
+    texts = {}
+    for elem in soup.find_all(True):
+        classes = elem.get('class')
+        for field in _match_fields(elem.name, ' '.join(classes) if classes else '', texts):
+            texts[field] = elem.get_text(strip=True)
+        
+        if len(texts) == len(_FIELD_CLASS_TOKENS):
+            break
+    
+    return texts
+
+
+def _extract_field_texts_lexbor(tree: 'LexborHTMLParser') -> Dict[str, str]:
+    """
+    _extract_field_texts のselectolax版
+    
+    Args:
+        tree: 物件詳細ページ
+    
+    Returns:
+        項目名とテキストの辞書（見つからない項目は含まない）
+    """
+    texts = {}
+    if tree.root is None:
+        return texts
+    
+    for node in tree.root.traverse():
+        for field in _match_fields(node.tag, node.attributes.get('class') or '', texts):
+            texts[field] = node.text(strip=True)
+        
+        if len(texts) == len(_FIELD_CLASS_TOKENS):
+            break
+    
+    return texts
+
 
 class AthomeScraper:
     """Athome物件スクレイパークラス"""
     
-    def __init__(self, config: Dict):
+    def __init__(self, config: 'ScraperConfig'):
         """
         スクレイパーを初期化
         
         Args:
-            config: 設定辞書
+            config: 設定オブジェクト
         """
         self.config = config
-        self.base_url = config.get('ATHOME_BASE_URL', 'https://www.athome.co.jp')
-        self.search_url = config.get('ATHOME_SEARCH_URL')
-        self.scraping_config = config.get('SCRAPING_CONFIG', {})
+        self.base_url = config.base_url
+        self.search_url = config.search_url
+        self.scraping_config = config.scraping
+        
+        # ルート相対パスの連結用（scheme://host）
+        parsed = urlparse(self.base_url)
+        self._origin = f"{parsed.scheme}://{parsed.netloc}"
         
         # セッション設定
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': self.scraping_config.get('user_agent', 
-                'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+                'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'),
+            # 展開可能な圧縮形式のみ要求（brはbrotliがある場合のみ含まれる）
+            'Accept-Encoding': make_headers(accept_encoding=True)['accept-encoding'],
+            'Connection': 'keep-alive'
         })
         
-        # データベースとランカーの初期化
-        db_path = config.get('DATABASE_CONFIG', {}).get('db_path', 'data/properties.db')
-        self.db = PropertyDatabase(db_path)
-        self.ranker = PropertyRanker(config)
+        # 物件詳細のHTMLパーサー（selectolax未導入時はlxmlを使用）
+        self.use_lexbor = (self.scraping_config.get('html_parser', 'lexbor') == 'lexbor'
+                           and LexborHTMLParser is not None)
+        
+        # 並列取得用のレート制御
+        self._rate_limiter = RateLimiter(self.scraping_config.get('request_delay', 2))
+        
+        # 一括保存の単位
+        self.batch_size = config.database.get('batch_size', 50)
         
         # スクレイピング統計
         self.stats = {
@@ -57,6 +209,16 @@ class AthomeScraper:
             'errors': 0
         }
     
+    @cached_property
+    def db(self) -> PropertyDatabase:
+        """データベース（初回アクセス時に初期化）"""
+        return PropertyDatabase(self.config.database.get('db_path', 'data/properties.db'))
+    
+    @cached_property
+    def ranker(self) -> PropertyRanker:
+        """ランカー（初回アクセス時に初期化）"""
+        return PropertyRanker(self.config)
+    
     def scrape_all(self) -> Dict:
         """
         全物件をスクレイピング
@@ -68,44 +230,21 @@ class AthomeScraper:
         self.stats['start_time'] = datetime.now()
         
         try:
+            # データベースはワーカースレッドからも参照するため、並列処理の前にメインスレッドで初期化
+            # （cached_property はPython 3.12以降ロックされず、同時アクセスで複数生成されうる）
+            self.db
+            
             # ページリストを取得
             property_urls = self._get_property_urls()
             logger.info(f"{len(property_urls)}件の物件URLを取得しました")
             
-            # 各物件の詳細を取得
-            active_property_ids = []
-            for i, url in enumerate(property_urls, 1):
-                try:
-                    logger.info(f"処理中: {i}/{len(property_urls)} - {url}")
-                    property_data = self._scrape_property_detail(url)
-                    
-                    if property_data:
-                        # ランク付け
-                        rank_info = self.ranker.calculate_rank(property_data)
-                        property_data.update(rank_info)
-                        
-                        # データベースに保存
-                        is_new, property_id = self.db.upsert_property(property_data)
-                        active_property_ids.append(property_id)
-                        
-                        if is_new:
-                            self.stats['new_properties'] += 1
-                            logger.info(f"新規物件: {property_data.get('title')} - {rank_info['ranking_grade']}級")
-                        else:
-                            self.stats['updated_properties'] += 1
-                        
-                        self.stats['total_properties'] += 1
-                    
-                    # リクエスト間隔
-                    time.sleep(self.scraping_config.get('request_delay', 2))
-                    
-                except Exception as e:
-                    logger.error(f"物件処理エラー: {url} - {e}")
-                    self.stats['errors'] += 1
-                    continue
+            # 各物件の詳細を並列取得（保存はメインスレッドで実施）
+            saver = BatchSaver(self.db, self.ranker, self.stats, self.batch_size)
+            fetch_and_save(self._scrape_property_detail, property_urls, saver,
+                           self.scraping_config.get('max_workers', 4))
             
             # 古い物件を非アクティブ化
-            deactivated = self.db.deactivate_old_properties(active_property_ids)
+            deactivated = self.db.deactivate_old_properties(saver.active_property_ids)
             
             # 統計を更新
             self.stats['end_time'] = datetime.now()
@@ -147,173 +286,237 @@ class AthomeScraper:
         """
         物件URLのリストを取得
         
+        一覧ページを max_workers 件ずつ並列に取得し、ページ順に集約する
+        
         Returns:
             物件URLのリスト
         """
         property_urls = []
-        page = 1
+        seen = set()
         max_pages = self.scraping_config.get('max_pages', 10)
+        window = self.scraping_config.get('max_workers', 4)
         
-        while True:
-            try:
-                # ページURLを構築
-                if page == 1:
-                    url = self.search_url
-                else:
-                    url = f"{self.search_url}?page={page}"
-                
-                logger.info(f"ページ{page}を取得中: {url}")
-                
-                # ページを取得
-                response = self.session.get(
-                    url,
-                    timeout=self.scraping_config.get('timeout', 30)
-                )
-                response.raise_for_status()
-                
-                # HTMLをパース
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # 物件リンクを抽出（サイト構造に応じて調整必要）
-                property_links = soup.select('a.property-link, .bukken-link a, .item-link')
-                
-                if not property_links:
-                    # 別のセレクタを試す
-                    property_links = soup.select('[class*="property"] a[href*="/detail/"], [class*="bukken"] a[href*="/detail/"]')
-                
-                if not property_links:
-                    logger.warning(f"ページ{page}で物件が見つかりません")
-                    break
+        page = 1
+        with ThreadPoolExecutor(max_workers=window) as executor:
+            while True:
+                last_page = page + window - 1
+                if max_pages:
+                    last_page = min(last_page, max_pages)
+                pages = range(page, last_page + 1)
                 
-                # URLを収集
-                for link in property_links:
-                    href = link.get('href')
-                    if href:
-                        full_url = urljoin(self.base_url, href)
-                        if '/detail/' in full_url or '/bukken/' in full_url:
+                finished = False
+                for current_page, (links, has_next) in zip(pages, executor.map(self._fetch_listing, pages)):
+                    # 物件のないページ以降は集計しない
+                    if links is None:
+                        finished = True
+                        break
+                    
+                    for full_url in links:
+                        if full_url not in seen:
+                            seen.add(full_url)
                             property_urls.append(full_url)
+                    
+                    if not has_next or (max_pages and current_page >= max_pages):
+                        finished = True
+                        break
                 
-                logger.info(f"ページ{page}から{len(property_links)}件の物件を取得")
-                
-                # 次のページがあるかチェック
-                next_button = soup.select_one('a.next-page, .pagination .next a, [class*="next"]')
-                if not next_button or (max_pages and page >= max_pages):
+                if finished:
                     break
-                
-                page += 1
-                time.sleep(self.scraping_config.get('request_delay', 2))
-                
-            except Exception as e:
-                logger.error(f"ページ取得エラー: ページ{page} - {e}")
-                break
+                page = last_page + 1
         
-        # 重複を除去
-        property_urls = list(set(property_urls))
         return property_urls
     
-    def _scrape_property_detail(self, url: str) -> Optional[Dict]:
+    def _fetch_listing(self, page: int) -> Tuple[Optional[List[str]], bool]:
         """
-        物件詳細をスクレイピング
+        一覧ページを1件取得して物件URLを抽出
         
         Args:
-            url: 物件詳細URL
+            page: ページ番号
         
         Returns:
-            物件データの辞書
+            (物件URLのリスト, 次ページの有無)。物件がない場合や取得失敗時はURLのリストがNone
         """
         try:
+            # ページURLを構築
+            if page == 1:
+                url = self.search_url
+            else:
+                url = f"{self.search_url}?page={page}"
+            
+            logger.info(f"ページ{page}を取得中: {url}")
+            
+            # ページを取得
+            self._rate_limiter.wait()
             response = self.session.get(
                 url,
                 timeout=self.scraping_config.get('timeout', 30)
             )
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # HTMLをパース
+            soup = BeautifulSoup(response.content, 'lxml')
+            
+            # 物件リンクを抽出（サイト構造に応じて調整必要）
+            property_links = _SEL_LISTING_LINKS.select(soup)
+            
+            if not property_links:
+                # 別のセレクタを試す
+                property_links = _SEL_LISTING_LINKS_FALLBACK.select(soup)
+            
+            if not property_links:
+                logger.warning(f"ページ{page}で物件が見つかりません")
+                return None, False
+            
+            # URLを収集
+            urls = []
+            for link in property_links:
+                href = link.get('href')
+                if href:
+                    full_url = self._absolute_url(href)
+                    if '/detail/' in full_url or '/bukken/' in full_url:
+                        urls.append(full_url)
+            
+            logger.info(f"ページ{page}から{len(property_links)}件の物件を取得")
+            
+            # 次のページがあるかチェック
+            has_next = _SEL_NEXT_PAGE.select_one(soup) is not None
+            return urls, has_next
             
+        except Exception as e:
+            logger.error(f"ページ取得エラー: ページ{page} - {e}")
+            return None, False
+    
+    def _scrape_property_detail(self, url: str) -> Optional[Dict]:
+        """
+        物件詳細をスクレイピング
+        
+        Args:
+            url: 物件詳細URL
+        
+        Returns:
+            物件データの辞書
+        """
+        try:
             # 物件IDを生成（URLから）
-            property_id = self._extract_property_id(url)
+            property_id = extract_property_id(url)
+            
+            # 前回取得時の検証子で条件付きリクエスト
+            cached = self.db.get_property(property_id)
+            headers = {}
+            if cached:
+                if cached.get('etag'):
+                    headers['If-None-Match'] = cached['etag']
+                if cached.get('last_modified'):
+                    headers['If-Modified-Since'] = cached['last_modified']
+            
+            self._rate_limiter.wait()
+            with self.session.get(
+                url,
+                headers=headers,
+                timeout=self.scraping_config.get('timeout', 30),
+                stream=True
+            ) as response:
+                if response.status_code == 304 and cached:
+                    logger.debug(f"未更新のためキャッシュを使用: {url}")
+                    return self._restore_cached_detail(cached)
+                
+                response.raise_for_status()
+                
+                # HTML以外は本文をダウンロードせずに破棄
+                content_type = response.headers.get('Content-Type', '')
+                if 'html' not in content_type:
+                    logger.warning(f"HTML以外のレスポンスをスキップ: {url} ({content_type})")
+                    return None
+                
+                content = response.content
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+            
+            # 本文が前回と同一ならパースを省略
+            content_hash = hashlib.blake2b(content, digest_size=16).hexdigest()
+            if cached and cached.get('content_hash') == content_hash:
+                logger.debug(f"内容が同一のためキャッシュを使用: {url}")
+                data = self._restore_cached_detail(cached)
+                # 検証子はこの応答の値に更新（ETagが変わるサーバーでも次回304を受けられるように）
+                data['etag'] = etag
+                data['last_modified'] = last_modified
+                return data
+            
+            # 各項目のテキストと画像URLを抽出
+            texts, image_srcs = self._parse_detail_html(content)
             
             # 基本情報を抽出
             data = {
                 'property_id': property_id,
                 'url': url,
-                'scraped_at': datetime.now().isoformat()
+                'scraped_at': int(time.time()),
+                'etag': etag,
+                'last_modified': last_modified,
+                'content_hash': content_hash
             }
             
             # タイトル
-            title_elem = soup.select_one('h1, .property-title, .bukken-title')
-            data['title'] = title_elem.get_text(strip=True) if title_elem else 'タイトルなし'
+            data['title'] = texts.get('title', 'タイトルなし')
             
             # 価格
-            price_elem = soup.select_one('.price, .kakaku, [class*="price"]')
-            if price_elem:
-                price_text = price_elem.get_text(strip=True)
+            price_text = texts.get('price')
+            if price_text:
                 data['price'] = price_text
                 # 数値を抽出（万円）
-                price_match = re.search(r'([\d,]+)\s*万円', price_text)
+                price_match = '万円' in price_text and _RE_PRICE.search(price_text)
                 if price_match:
                     data['price_numeric'] = int(price_match.group(1).replace(',', ''))
             
             # 住所
-            address_elem = soup.select_one('.address, .jusho, [class*="address"]')
-            data['address'] = address_elem.get_text(strip=True) if address_elem else ''
+            data['address'] = texts.get('address', '')
             
             # 土地面積
-            area_elem = soup.select_one('[class*="area"], [class*="menseki"]')
-            if area_elem:
-                area_text = area_elem.get_text(strip=True)
+            area_text = texts.get('area')
+            if area_text:
                 data['land_area'] = area_text
                 
                 # 平米を抽出
-                m2_match = re.search(r'([\d,]+\.?\d*)\s*m2|㎡', area_text)
+                m2_match = ('㎡' in area_text or 'm2' in area_text) and _RE_M2.search(area_text)
                 if m2_match:
                     land_area_m2 = float(m2_match.group(1).replace(',', ''))
                     data['land_area_m2'] = land_area_m2
                     data['land_area_tsubo'] = land_area_m2 / 3.305785  # 坪に変換
                 
                 # 坪を直接抽出
-                tsubo_match = re.search(r'([\d,]+\.?\d*)\s*坪', area_text)
+                tsubo_match = '坪' in area_text and _RE_TSUBO.search(area_text)
                 if tsubo_match:
                     data['land_area_tsubo'] = float(tsubo_match.group(1).replace(',', ''))
             
             # 最寄駅
-            station_elem = soup.select_one('[class*="station"], [class*="eki"]')
-            if station_elem:
-                station_text = station_elem.get_text(strip=True)
+            station_text = texts.get('station')
+            if station_text:
                 data['nearest_station'] = station_text
                 
                 # 徒歩時間を抽出
-                walk_match = re.search(r'徒歩\s*(\d+)\s*分', station_text)
+                walk_match = '徒歩' in station_text and _RE_WALK.search(station_text)
                 if walk_match:
                     data['walk_time'] = f"徒歩{walk_match.group(1)}分"
                     data['walk_minutes'] = int(walk_match.group(1))
             
             # 建ぺい率・容積率
-            coverage_elem = soup.select_one('[class*="kenpei"]')
-            if coverage_elem:
-                coverage_text = coverage_elem.get_text(strip=True)
-                coverage_match = re.search(r'(\d+)\s*[%％]', coverage_text)
+            coverage_text = texts.get('coverage')
+            if coverage_text:
+                coverage_match = _has_percent(coverage_text) and _RE_PCT.search(coverage_text)
                 if coverage_match:
                     data['building_coverage'] = float(coverage_match.group(1))
             
-            ratio_elem = soup.select_one('[class*="yoseki"]')
-            if ratio_elem:
-                ratio_text = ratio_elem.get_text(strip=True)
-                ratio_match = re.search(r'(\d+)\s*[%％]', ratio_text)
+            ratio_text = texts.get('ratio')
+            if ratio_text:
+                ratio_match = _has_percent(ratio_text) and _RE_PCT.search(ratio_text)
                 if ratio_match:
                     data['floor_area_ratio'] = float(ratio_match.group(1))
             
             # 用途地域
-            usage_elem = soup.select_one('[class*="youto"], [class*="chiiki"]')
-            data['usage_area'] = usage_elem.get_text(strip=True) if usage_elem else ''
+            data['usage_area'] = texts.get('usage', '')
             
             # 画像URL
-            image_urls = []
-            for img in soup.select('.property-image img, .bukken-image img, [class*="photo"] img'):
-                img_url = img.get('src') or img.get('data-src')
-                if img_url:
-                    image_urls.append(urljoin(self.base_url, img_url))
-            data['image_urls'] = image_urls[:5]  # 最大5枚
+            image_urls = [self._absolute_url(src) for src in image_srcs[:5]]
+            data['image_urls'] = image_urls  # 最大5枚
             
             # 生データを保存（デバッグ用）
             data['raw_data'] = {
@@ -328,22 +531,63 @@ class AthomeScraper:
             logger.error(f"物件詳細取得エラー: {url} - {e}")
             return None
     
-    def _extract_property_id(self, url: str) -> str:
+    def _absolute_url(self, href: str) -> str:
+        """
+        リンクを絶対URLに変換
+        
+        絶対URLとルート相対パスは文字列操作のみで処理し、
+        それ以外（//始まり、相対パス、クエリのみ）はurljoinに任せる
+        
+        Args:
+            href: リンク
+        
+        Returns:
+            絶対URL
+        """
+        if href.startswith(('https://', 'http://')):
+            return href
+        if href.startswith('/') and not href.startswith('//'):
+            return self._origin + href
+        return urljoin(self.base_url, href)
+    
+    def _parse_detail_html(self, content: bytes) -> Tuple[Dict[str, str], List[str]]:
         """
-        URLから物件IDを抽出
+        物件詳細ページを解析
         
         Args:
-            url: 物件URL
+            content: レスポンス本文
         
         Returns:
-            物件ID
+            (項目名とテキストの辞書, 画像URLのリスト)
+        """
+        if self.use_lexbor:
+            tree = LexborHTMLParser(content)
+            texts = _extract_field_texts_lexbor(tree)
+            srcs = [
+                img.attributes.get('src') or img.attributes.get('data-src')
+                for img in tree.css(_IMAGE_SELECTOR)
+            ]
+        else:
+            soup = BeautifulSoup(content, 'lxml')
+            texts = _extract_field_texts(soup)
+            srcs = [img.get('src') or img.get('data-src') for img in _SEL_IMAGES.select(soup)]
+        
+        return texts, [src for src in srcs if src]
+    
+    def _restore_cached_detail(self, cached: Dict) -> Dict:
         """
-        # URLパスから数値部分を抽出
-        path = urlparse(url).path
-        id_match = re.search(r'/(\d+)', path)
-        if id_match:
-            return f"athome_{id_match.group(1)}"
+        データベースの既存レコードから物件データを復元
         
-        # フォールバック：URLのハッシュ値
-        import hashlib
-        return f"athome_{hashlib.md5(url.encode()).hexdigest()[:10]}"
\ No newline at end of file
+        Args:
+            cached: get_propertyで取得した物件情報
+        
+        Returns:
+            物件データの辞書
+        """
+        data = {
+            field: cached[field]
+            for field in _DETAIL_FIELDS
+            if cached.get(field) is not None
+        }
+        data['scraped_at'] = int(time.time())
+        return data
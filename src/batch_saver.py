@@ -0,0 +1,128 @@
+"""
+物件データ一括保存モジュール
+HTTP版・Selenium版のスクレイパーで、並列取得した物件データをまとめてランク付け・保存する
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from .database import PropertyDatabase
+    from .ranking import PropertyRanker
+
+logger = logging.getLogger(__name__)
+
+
+class BatchSaver:
+    """保存待ちの物件データをまとめてランク付けし、1トランザクションで保存する"""
+    
+    def __init__(self, db: 'PropertyDatabase', ranker: 'PropertyRanker', stats: Dict,
+                 batch_size: int, active_property_ids: Optional[List[str]] = None):
+        """
+        一括保存を初期化
+        
+        Args:
+            db: 保存先のデータベース
+            ranker: ランカー
+            stats: 件数を加算するスクレイピング統計
+            batch_size: 1トランザクションでまとめて保存する物件数
+            active_property_ids: 保存した物件IDを追加するリスト（省略時は空のリスト）
+        """
+        self.db = db
+        self.ranker = ranker
+        self.stats = stats
+        self.batch_size = batch_size
+        self.active_property_ids = active_property_ids if active_property_ids is not None else []
+        self._pending = []
+    
+    def add(self, property_data: Dict):
+        """
+        物件データを保存待ちに追加し、件数がバッチサイズに達したら保存
+        
+        Args:
+            property_data: 物件データ
+        """
+        self._pending.append(property_data)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+    
+    def flush(self):
+        """保存待ちの物件データをランク付けし、1トランザクションでデータベースに保存"""
+        if not self._pending:
+            return
+        
+        # 保存に失敗しても同じデータを再送しないよう、先に保存待ちを空にする
+        batch, self._pending = self._pending, []
+        
+        # まとめてランク付け
+        for property_data, rank_info in zip(batch, self.ranker.calculate_ranks(batch)):
+            property_data.update(rank_info)
+        
+        self._save_batch(batch)
+    
+    def _save_batch(self, batch: List[Dict]):
+        """
+        物件データを1トランザクションで保存
+        
+        失敗した場合は半分に分けて保存し直し、保存できない物件のみをエラーとして除外する
+        
+        Args:
+            batch: ランク付け済みの物件データのリスト
+        """
+        try:
+            results = self.db.upsert_properties_batch(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                logger.error(f"物件保存エラー: {batch[0].get('url')} - {e}")
+                self.stats['errors'] += 1
+                return
+            
+            middle = len(batch) // 2
+            self._save_batch(batch[:middle])
+            self._save_batch(batch[middle:])
+            return
+        
+        for property_data, (is_new, property_id) in zip(batch, results):
+            self.active_property_ids.append(property_id)
+            
+            if is_new:
+                self.stats['new_properties'] += 1
+                logger.info(f"新規物件: {property_data.get('title')} - {property_data['ranking_grade']}級")
+            else:
+                self.stats['updated_properties'] += 1
+            
+            self.stats['total_properties'] += 1
+
+
+def fetch_and_save(fetch: Callable[[str], Optional[Dict]], urls: List[str],
+                   saver: BatchSaver, max_workers: int):
+    """
+    各物件の詳細を並列取得し、取得できた物件データを保存（保存はメインスレッドで実施）
+    
+    Args:
+        fetch: URLから物件データを取得する関数（取得失敗時はNoneを返す）
+        urls: 物件詳細URLのリスト
+        saver: 保存先の一括保存
+        max_workers: 並列取得のスレッド数
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {executor.submit(fetch, url): url for url in urls}
+        for i, future in enumerate(as_completed(futures), 1):
+            url = futures[future]
+            try:
+                property_data = future.result()
+                if property_data:
+                    saver.add(property_data)
+                logger.info(f"処理済み: {i}/{len(urls)} - {url}")
+            except Exception as e:
+                logger.error(f"物件処理エラー: {url} - {e}")
+                saver.stats['errors'] += 1
+    except BaseException:
+        # SIGTERM・Ctrl+C時は待機中の取得を破棄し、すぐに後始末へ進む
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+    
+    # 残りの物件データを保存
+    saver.flush()
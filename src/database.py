@@ -2,15 +2,119 @@
 データベース管理モジュール
 SQLiteを使用した物件情報の永続化
 """
+import copy
 import sqlite3
-import json
-from datetime import datetime
+import threading
+import time
+from contextlib import closing, contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import FrozenSet, Iterable, Iterator, List, Dict, Optional, Tuple
 import logging
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+# 現在のUNIX時刻（scraped_at / updated_at はINTEGERで保存）
+_UNIX_NOW = "CAST(strftime('%s', 'now') AS INTEGER)"
+
+# ランク付け結果の一括更新
+_UPDATE_RANKING = f"""
+    UPDATE properties
+    SET ranking_score = ?, ranking_grade = ?, price_evaluation = ?, location_evaluation = ?,
+        area_evaluation = ?, investment_evaluation = ?, updated_at = {_UNIX_NOW}
+    WHERE property_id = ?
+"""
+
+# CSV出力時に変換するカラム
+# （別名をカラム名と同じにすると ORDER BY が変換後の文字列を参照し、インデックス順が使えなくなる）
+_CSV_COLUMN_EXPRESSIONS = {
+    'scraped_at': "datetime(scraped_at, 'unixepoch', 'localtime') AS scraped_at_local",
+}
+
+# INSERT時に必須のカラム（欠けている既存物件はUPDATEのみで更新）
+_REQUIRED_COLUMNS = frozenset(('property_id', 'url', 'title'))
+
+# JSON文字列で保存するカラム
+_JSON_COLUMNS = ('image_urls', 'raw_data')
+
+# スキーマのバージョン（PRAGMA user_version、データ移行を1回だけ実行するため）
+_SCHEMA_VERSION = 1
+
+# 接続時に1回だけ適用するPRAGMA（WAL + synchronous=NORMALでコミット毎のfsyncを回避）
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# よく使うSELECT文（SQL文字列を固定してsqlite3のステートメントキャッシュに載せる）
+_SELECT_PROPERTY = "SELECT * FROM properties WHERE property_id = ?"
+_SELECT_ACTIVE = "SELECT * FROM properties WHERE is_active = 1"
+_ORDER_BY_RANKING = " ORDER BY ranking_score DESC, scraped_at DESC"
+# 統計情報（ランク別件数・最終実行ログ・高ランク物件）を1回のクエリで取得
+_STATISTICS_QUERY = """
+    SELECT 'rank', ranking_grade, COUNT(*), NULL, NULL, NULL, NULL
+    FROM properties
+    WHERE is_active = 1
+    GROUP BY ranking_grade
+    UNION ALL
+    SELECT 'last', * FROM (
+        SELECT execution_time, new_properties, total_properties, NULL, NULL, NULL
+        FROM scraping_logs
+        ORDER BY execution_time DESC
+        LIMIT 1
+    )
+    UNION ALL
+    SELECT 'top', * FROM (
+        SELECT property_id, title, price, address, ranking_grade, ranking_score
+        FROM properties
+        WHERE is_active = 1 AND ranking_grade IN ('S', 'A')
+        ORDER BY ranking_score DESC
+        LIMIT 10
+    )
+"""
+# IDリストはJSON配列1個で渡す（件数に関わらずSQL文が同一になりキャッシュが効く）
+_SELECT_EXISTING_IDS = (
+    "SELECT property_id FROM properties WHERE property_id IN (SELECT value FROM json_each(?))"
+)
+
+# 指定時刻以降に取得済みのアクティブ物件（idx_url_scraped_at で引く）
+_SELECT_RECENT_URLS = """
+    SELECT url, property_id FROM properties
+    WHERE url IN (SELECT value FROM json_each(?)) AND scraped_at >= ? AND is_active = 1
+"""
+
+
+def _column_names(cursor: sqlite3.Cursor) -> Tuple[str, ...]:
+    """直前に実行したクエリの列名を取得"""
+    return tuple(description[0] for description in cursor.description)
+
+
+def _decode_row(columns: Tuple[str, ...], row: tuple) -> Dict:
+    """
+    行を辞書に変換し、JSONカラムをパース
+    
+    Args:
+        columns: 列名
+        row: 検索結果の行
+    
+    Returns:
+        物件情報の辞書（パースできないJSONは文字列のまま）
+    """
+    data = dict(zip(columns, row))
+    for column in _JSON_COLUMNS:
+        value = data.get(column)
+        if value:
+            try:
+                data[column] = orjson.loads(value)
+            except orjson.JSONDecodeError:
+                pass
+    return data
+
 
 class PropertyDatabase:
     """物件データベース管理クラス"""
@@ -24,13 +128,68 @@ class PropertyDatabase:
         """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # 接続は1本を使い回す（スレッド間の排他はロックで行う）
+        self._conn = sqlite3.connect(
+            self.db_path, isolation_level=None, check_same_thread=False, cached_statements=256
+        )
+        self._lock = threading.RLock()
+        
+        # カラム構成（と更新のみかどうか）ごとに組み立て済みのUPSERT文
+        self._stmt_cache: Dict[Tuple[FrozenSet[str], bool], Tuple[str, Tuple[str, ...]]] = {}
+        
+        # 物件情報のキャッシュ（データベースのバージョンをキーに含めるため更新後は再取得される）
+        self._load_property_cached = lru_cache(maxsize=4096)(self._load_property)
+        
+        # 統計情報のキャッシュ（データベースのバージョン, 統計情報）
+        self._stats_cache: Tuple[Optional[Tuple[int, int]], Optional[Dict]] = (None, None)
+        
         self.init_database()
     
+    def close(self):
+        """データベース接続を閉じる"""
+        with self._lock:
+            self._conn.close()
+    
+    def _data_version(self) -> Tuple[int, int]:
+        """
+        データベースの変更を検知するためのバージョンを取得
+        
+        他の接続のコミットで増える data_version と、この接続での変更行数の組
+        
+        Returns:
+            (data_version, total_changes)
+        """
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0], self._conn.total_changes
+    
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Cursor]:
+        """
+        書き込み用トランザクション
+        
+        ロックを保持したままBEGIN〜COMMITを実行し、例外時はROLLBACKする
+        
+        Yields:
+            データベースカーソル
+        """
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
+    
     def init_database(self):
         """データベースとテーブルを初期化"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
+        with self._lock:
+            for pragma in _CONNECTION_PRAGMAS:
+                self._conn.execute(pragma)
+        
+        with self._transaction() as cursor:
             # 物件情報テーブル
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS properties (
@@ -62,13 +221,38 @@ class PropertyDatabase:
                     location_evaluation REAL,
                     area_evaluation REAL,
                     investment_evaluation REAL,
-                    scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    scraped_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+                    updated_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
                     is_active BOOLEAN DEFAULT 1,
-                    raw_data TEXT
+                    raw_data TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    content_hash TEXT
                 )
             """)
             
+            # 既存データベースに後から追加したカラムを補完
+            cursor.execute("PRAGMA table_info(properties)")
+            existing_columns = {row[1] for row in cursor.fetchall()}
+            for column in ('etag', 'last_modified', 'content_hash'):
+                if column not in existing_columns:
+                    cursor.execute(f"ALTER TABLE properties ADD COLUMN {column} TEXT")
+            
+            schema_version = cursor.execute("PRAGMA user_version").fetchone()[0]
+            
+            # 文字列で保存されていた日時をUNIX時刻に変換
+            # （マイクロ秒付きはPython側のローカル時刻、それ以外はCURRENT_TIMESTAMPのUTC）
+            if schema_version < 1:
+                for column in ('scraped_at', 'updated_at'):
+                    cursor.execute(f"""
+                        UPDATE properties
+                        SET {column} = CAST(strftime(
+                            '%s', {column},
+                            CASE WHEN {column} GLOB '*[T.]*' THEN 'utc' ELSE '+0 seconds' END
+                        ) AS INTEGER)
+                        WHERE typeof({column}) = 'text'
+                    """)
+            
             # スクレイピングログテーブル
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS scraping_logs (
@@ -99,12 +283,26 @@ class PropertyDatabase:
             """)
             
             # インデックスの作成
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_property_id ON properties(property_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_ranking_grade ON properties(ranking_grade)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_is_active ON properties(is_active)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_scraped_at ON properties(scraped_at)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_url_scraped_at ON properties(url, scraped_at)")
+            # アクティブ物件のランキング順（ソートを省略するための部分インデックス）
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_active_rank
+                ON properties(ranking_score DESC, scraped_at DESC) WHERE is_active = 1
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_active_grade_rank
+                ON properties(ranking_grade, ranking_score DESC) WHERE is_active = 1
+            """)
+            # 上記の部分インデックスで代替できるため削除（残すとプランナーが優先してしまう）
+            cursor.execute("DROP INDEX IF EXISTS idx_ranking_grade")
+            cursor.execute("DROP INDEX IF EXISTS idx_is_active")
+            # property_id はUNIQUE制約の自動インデックスと重複するため削除
+            cursor.execute("DROP INDEX IF EXISTS idx_property_id")
+            
+            if schema_version < _SCHEMA_VERSION:
+                cursor.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
             
-            conn.commit()
             logger.info(f"データベースを初期化しました: {self.db_path}")
     
     def upsert_property(self, property_data: Dict) -> Tuple[bool, str]:
@@ -117,58 +315,132 @@ class PropertyDatabase:
         Returns:
             (is_new, property_id): 新規物件かどうかとプロパティID
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            property_id = property_data.get('property_id')
-            
-            # 既存データの確認
-            cursor.execute("SELECT * FROM properties WHERE property_id = ?", (property_id,))
-            existing = cursor.fetchone()
-            
+        return self.upsert_properties_batch([property_data])[0]
+    
+    def upsert_properties_batch(self, properties: List[Dict]) -> List[Tuple[bool, str]]:
+        """
+        複数の物件情報を1トランザクションで挿入または更新
+        
+        カラム構成が同じ連続した物件ごとに INSERT ... ON CONFLICT DO UPDATE を
+        executemany で実行する（入力順に反映）。登録済みの物件で必須カラム（url, title）を
+        含まない部分的なデータは、指定されたカラムのみをUPDATEする
+        
+        Args:
+            properties: 物件データの辞書のリスト
+        
+        Returns:
+            各物件の (is_new, property_id) のリスト
+        """
+        if not properties:
+            return []
+        
+        for property_data in properties:
             # JSON形式のデータを文字列に変換
-            if 'image_urls' in property_data and isinstance(property_data['image_urls'], list):
-                property_data['image_urls'] = json.dumps(property_data['image_urls'])
+            for column in _JSON_COLUMNS:
+                if isinstance(property_data.get(column), (list, dict)):
+                    property_data[column] = orjson.dumps(property_data[column]).decode()
+        
+        property_ids = [property_data.get('property_id') for property_data in properties]
+        
+        with self._transaction() as cursor:
+            known_ids = self._existing_property_ids(cursor, property_ids)
             
-            if 'raw_data' in property_data and isinstance(property_data['raw_data'], dict):
-                property_data['raw_data'] = json.dumps(property_data['raw_data'])
+            # 同じ物件が複数回含まれても入力順に反映されるよう、SQL文が同じ連続した行のみまとめる
+            runs: List[Tuple[str, List[tuple]]] = []
+            saved_ids = set(known_ids)
+            for property_data in properties:
+                property_id = property_data.get('property_id')
+                update_only = (property_id in saved_ids
+                               and not _REQUIRED_COLUMNS <= property_data.keys())
+                saved_ids.add(property_id)
+                query, columns = self._upsert_plan(property_data, update_only)
+                params = tuple(property_data[column] for column in columns)
+                if runs and runs[-1][0] == query:
+                    runs[-1][1].append(params)
+                else:
+                    runs.append((query, [params]))
             
-            if existing:
-                # 更新
-                update_fields = []
-                update_values = []
-                
-                for key, value in property_data.items():
-                    if key != 'property_id':
-                        update_fields.append(f"{key} = ?")
-                        update_values.append(value)
-                
-                update_values.append(datetime.now())
-                update_values.append(property_id)
-                
+            for query, rows in runs:
+                cursor.executemany(query, rows)
+        
+        results = []
+        for property_id in property_ids:
+            if property_id in known_ids:
+                logger.debug(f"物件を更新しました: {property_id}")
+                results.append((False, property_id))
+            else:
+                logger.info(f"新規物件を追加しました: {property_id}")
+                known_ids.add(property_id)
+                results.append((True, property_id))
+        
+        return results
+    
+    def _existing_property_ids(self, cursor: sqlite3.Cursor, property_ids: List[str]) -> set:
+        """
+        登録済みの物件IDを取得
+        
+        Args:
+            cursor: データベースカーソル
+            property_ids: 確認する物件IDのリスト
+        
+        Returns:
+            登録済みの物件IDの集合
+        """
+        cursor.execute(_SELECT_EXISTING_IDS, (orjson.dumps(property_ids).decode(),))
+        return {row[0] for row in cursor.fetchall()}
+    
+    def _upsert_plan(self, property_data: Dict, update_only: bool = False) -> Tuple[str, Tuple[str, ...]]:
+        """
+        物件データのキー構成に対応するUPSERT文を取得（構成ごとに初回のみ組み立て）
+        
+        Args:
+            property_data: 物件データの辞書
+            update_only: 登録済みの物件をUPDATE文のみで更新する場合True
+        
+        Returns:
+            (SQL文, パラメータの並び順のカラム)
+        """
+        key = (frozenset(property_data), update_only)
+        plan = self._stmt_cache.get(key)
+        if plan is None:
+            fields = tuple(sorted(column for column in key[0] if column != 'property_id'))
+            if update_only:
+                updates = [f"{column} = ?" for column in fields]
+                updates.append(f"updated_at = {_UNIX_NOW}")
                 query = f"""
-                    UPDATE properties 
-                    SET {', '.join(update_fields)}, updated_at = ?
+                    UPDATE properties SET {', '.join(updates)}
                     WHERE property_id = ?
                 """
-                
-                cursor.execute(query, update_values)
-                logger.debug(f"物件を更新しました: {property_id}")
-                return False, property_id
+                columns = fields + ('property_id',)
             else:
-                # 新規挿入
-                columns = list(property_data.keys())
-                placeholders = ['?' for _ in columns]
-                values = list(property_data.values())
-                
+                columns = tuple(sorted(key[0]))
+                updates = [f"{column} = excluded.{column}" for column in fields]
+                updates.append(f"updated_at = {_UNIX_NOW}")
                 query = f"""
                     INSERT INTO properties ({', '.join(columns)})
-                    VALUES ({', '.join(placeholders)})
+                    VALUES ({', '.join('?' for _ in columns)})
+                    ON CONFLICT(property_id) DO UPDATE SET {', '.join(updates)}
                 """
-                
-                cursor.execute(query, values)
-                logger.info(f"新規物件を追加しました: {property_id}")
-                return True, property_id
+            plan = self._stmt_cache[key] = (query, columns)
+        return plan
+    
+    def update_rankings(self, rows: Iterable[Tuple[float, str, float, float, float, float, str]]) -> int:
+        """
+        ランク付け結果を1トランザクションで一括更新
+        
+        Args:
+            rows: (ranking_score, ranking_grade, price_evaluation, location_evaluation,
+                   area_evaluation, investment_evaluation, property_id) のイテラブル
+        
+        Returns:
+            更新した件数
+        """
+        with self._transaction() as cursor:
+            cursor.executemany(_UPDATE_RANKING, rows)
+            updated = cursor.rowcount
+        
+        logger.info(f"{updated}件の物件のランクを更新しました")
+        return updated
     
     def get_property(self, property_id: str) -> Optional[Dict]:
         """
@@ -177,76 +449,100 @@ class PropertyDatabase:
         Args:
             property_id: 物件ID
         
+        Returns:
+            物件情報の辞書（image_urls / raw_data はキャッシュと共有のため変更しないこと）
+        """
+        data = self._load_property_cached(property_id, self._data_version())
+        return dict(data) if data is not None else None
+    
+    def _load_property(self, property_id: str, version: Tuple[int, int]) -> Optional[Dict]:
+        """
+        物件情報をデータベースから読み込む（get_property のキャッシュ本体）
+        
+        Args:
+            property_id: 物件ID
+            version: キャッシュキー用のデータベースのバージョン
+        
         Returns:
             物件情報の辞書
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute("SELECT * FROM properties WHERE property_id = ?", (property_id,))
+        with self._lock:
+            cursor = self._conn.execute(_SELECT_PROPERTY, (property_id,))
             row = cursor.fetchone()
             
             if row:
-                data = dict(row)
-                # JSON文字列をパース
-                if data.get('image_urls'):
-                    try:
-                        data['image_urls'] = json.loads(data['image_urls'])
-                    except:
-                        pass
-                if data.get('raw_data'):
-                    try:
-                        data['raw_data'] = json.loads(data['raw_data'])
-                    except:
-                        pass
-                return data
+                return _decode_row(_column_names(cursor), row)
             return None
     
-    def get_active_properties(self, rank_filter: Optional[List[str]] = None) -> List[Dict]:
+    def get_recent_urls(self, urls: List[str], ttl_hours: float) -> Dict[str, str]:
+        """
+        指定時間内に取得済みの物件URLを取得
+        
+        Args:
+            urls: 確認する物件URLのリスト
+            ttl_hours: 再取得しない期間（時間）
+        
+        Returns:
+            URLから物件IDへの辞書
+        """
+        if not urls or ttl_hours <= 0:
+            return {}
+        
+        since = int(time.time() - ttl_hours * 3600)
+        with self._lock:
+            cursor = self._conn.execute(_SELECT_RECENT_URLS, (orjson.dumps(urls).decode(), since))
+            return dict(cursor.fetchall())
+    
+    def get_active_properties(self, rank_filter: Optional[List[str]] = None,
+                              columns: Optional[List[str]] = None) -> List[Dict]:
         """
         アクティブな物件を取得
         
         Args:
             rank_filter: ランクでフィルタリング（例: ['S', 'A']）
+            columns: 取得するカラム（省略時は全カラム）
         
         Returns:
             物件情報のリスト
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            query = "SELECT * FROM properties WHERE is_active = 1"
-            params = []
-            
-            if rank_filter:
-                placeholders = ','.join(['?' for _ in rank_filter])
-                query += f" AND ranking_grade IN ({placeholders})"
-                params.extend(rank_filter)
-            
-            query += " ORDER BY ranking_score DESC, scraped_at DESC"
-            
-            cursor.execute(query, params)
+        query, params = self._active_query(rank_filter, columns)
+        
+        with self._lock:
+            cursor = self._conn.execute(query, params)
+            names = _column_names(cursor)
             rows = cursor.fetchall()
-            
-            properties = []
-            for row in rows:
-                data = dict(row)
-                # JSON文字列をパース
-                if data.get('image_urls'):
-                    try:
-                        data['image_urls'] = json.loads(data['image_urls'])
-                    except:
-                        pass
-                if data.get('raw_data'):
-                    try:
-                        data['raw_data'] = json.loads(data['raw_data'])
-                    except:
-                        pass
-                properties.append(data)
-            
-            return properties
+        
+        # 行はタプルのまま取得し、列名と組み合わせて辞書にする
+        # JSONカラムを含まない場合はパースを省略
+        if columns and not any(column in _JSON_COLUMNS for column in columns):
+            return [dict(zip(names, row)) for row in rows]
+        return [_decode_row(names, row) for row in rows]
+    
+    def _active_query(self, rank_filter: Optional[List[str]] = None,
+                      columns: Optional[List[str]] = None) -> Tuple[str, List]:
+        """
+        アクティブな物件を取得するSQLを組み立て
+        
+        Args:
+            rank_filter: ランクフィルター
+            columns: 取得するカラム（省略時は全カラム）
+        
+        Returns:
+            (SQL文, パラメータ)
+        """
+        if columns:
+            query = f"SELECT {', '.join(columns)} FROM properties WHERE is_active = 1"
+        else:
+            query = _SELECT_ACTIVE
+        params = []
+        
+        if rank_filter:
+            placeholders = ','.join(['?' for _ in rank_filter])
+            query += f" AND ranking_grade IN ({placeholders})"
+            params.extend(rank_filter)
+        
+        query += _ORDER_BY_RANKING
+        return query, params
     
     def deactivate_old_properties(self, active_property_ids: List[str]):
         """
@@ -255,22 +551,27 @@ class PropertyDatabase:
         Args:
             active_property_ids: アクティブな物件IDのリスト
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._transaction() as cursor:
+            # 件数に関わらず同じSQL文になるよう、アクティブIDは一時テーブル経由で渡す
+            cursor.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS active_ids (
+                    property_id TEXT PRIMARY KEY
+                ) WITHOUT ROWID
+            """)
+            cursor.execute("DELETE FROM active_ids")
+            cursor.executemany(
+                "INSERT OR IGNORE INTO active_ids VALUES (?)",
+                ((property_id,) for property_id in active_property_ids)
+            )
             
-            if active_property_ids:
-                placeholders = ','.join(['?' for _ in active_property_ids])
-                query = f"""
-                    UPDATE properties 
-                    SET is_active = 0, updated_at = ?
-                    WHERE property_id NOT IN ({placeholders}) AND is_active = 1
-                """
-                params = [datetime.now()] + active_property_ids
-            else:
-                query = "UPDATE properties SET is_active = 0, updated_at = ? WHERE is_active = 1"
-                params = [datetime.now()]
+            query = f"""
+                UPDATE properties 
+                SET is_active = 0, updated_at = {_UNIX_NOW}
+                WHERE is_active = 1
+                  AND property_id NOT IN (SELECT property_id FROM active_ids)
+            """
             
-            cursor.execute(query, params)
+            cursor.execute(query)
             deactivated = cursor.rowcount
             
             if deactivated > 0:
@@ -285,9 +586,7 @@ class PropertyDatabase:
         Args:
             log_data: ログデータの辞書
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
+        with self._transaction() as cursor:
             columns = list(log_data.keys())
             placeholders = ['?' for _ in columns]
             values = list(log_data.values())
@@ -298,7 +597,6 @@ class PropertyDatabase:
             """
             
             cursor.execute(query, values)
-            conn.commit()
     
     def get_statistics(self) -> Dict:
         """
@@ -307,80 +605,60 @@ class PropertyDatabase:
         Returns:
             統計情報の辞書
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            stats = {}
-            
-            # 総物件数
-            cursor.execute("SELECT COUNT(*) FROM properties WHERE is_active = 1")
-            stats['total_active_properties'] = cursor.fetchone()[0]
-            
-            # ランク別件数
-            cursor.execute("""
-                SELECT ranking_grade, COUNT(*) as count 
-                FROM properties 
-                WHERE is_active = 1 
-                GROUP BY ranking_grade
-            """)
-            stats['properties_by_rank'] = {row[0]: row[1] for row in cursor.fetchall()}
-            
-            # 最終スクレイピング時刻
-            cursor.execute("""
-                SELECT execution_time, new_properties, total_properties 
-                FROM scraping_logs 
-                ORDER BY execution_time DESC 
-                LIMIT 1
-            """)
-            last_scraping = cursor.fetchone()
-            if last_scraping:
+        # 前回から変更がなければキャッシュを返す
+        version = self._data_version()
+        cached_version, cached_stats = self._stats_cache
+        if version == cached_version:
+            return copy.deepcopy(cached_stats)
+        
+        stats = {
+            'total_active_properties': 0,
+            'properties_by_rank': {},
+            'high_rank_properties': []
+        }
+        
+        with self._lock:
+            rows = self._conn.execute(_STATISTICS_QUERY).fetchall()
+        
+        for section, *values in rows:
+            if section == 'rank':
+                # ランク別件数（合計が総物件数）
+                grade, count = values[:2]
+                stats['properties_by_rank'][grade] = count
+                stats['total_active_properties'] += count
+            elif section == 'last':
+                # 最終スクレイピング時刻
                 stats['last_scraping'] = {
-                    'time': last_scraping[0],
-                    'new_properties': last_scraping[1],
-                    'total_properties': last_scraping[2]
-                }
-            
-            # 高ランク物件（S,A）
-            cursor.execute("""
-                SELECT property_id, title, price, address, ranking_grade, ranking_score 
-                FROM properties 
-                WHERE is_active = 1 AND ranking_grade IN ('S', 'A')
-                ORDER BY ranking_score DESC 
-                LIMIT 10
-            """)
-            stats['high_rank_properties'] = [
-                {
-                    'property_id': row[0],
-                    'title': row[1],
-                    'price': row[2],
-                    'address': row[3],
-                    'ranking_grade': row[4],
-                    'ranking_score': row[5]
+                    'time': values[0],
+                    'new_properties': values[1],
+                    'total_properties': values[2]
                 }
-                for row in cursor.fetchall()
-            ]
-            
-            return stats
+            else:
+                # 高ランク物件（S,A）
+                stats['high_rank_properties'].append({
+                    'property_id': values[0],
+                    'title': values[1],
+                    'price': values[2],
+                    'address': values[3],
+                    'ranking_grade': values[4],
+                    'ranking_score': values[5]
+                })
+        
+        self._stats_cache = (version, stats)
+        return copy.deepcopy(stats)
     
     def export_to_csv(self, output_path: str, rank_filter: Optional[List[str]] = None):
         """
         CSVファイルにエクスポート
         
+        カーソルから1行ずつ書き出すため、件数に関わらずメモリ使用量は一定
+        
         Args:
             output_path: 出力ファイルパス
             rank_filter: ランクフィルター
         """
         import csv
         
-        properties = self.get_active_properties(rank_filter)
-        
-        if not properties:
-            logger.warning("エクスポートする物件がありません")
-            return
-        
-        output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
         # CSV用のフィールドを準備
         fieldnames = [
             'property_id', 'title', 'price', 'address', 'land_area', 'land_area_tsubo',
@@ -389,9 +667,34 @@ class PropertyDatabase:
             'url', 'scraped_at'
         ]
         
-        with open(output_path, 'w', newline='', encoding='utf-8-sig') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
-            writer.writeheader()
-            writer.writerows(properties)
+        # 日時はUNIX時刻で保存しているためローカル時刻の文字列に変換して出力
+        columns = [_CSV_COLUMN_EXPRESSIONS.get(field, field) for field in fieldnames]
+        query, params = self._active_query(rank_filter, columns)
+        
+        # 書き出し中も他スレッドの読み書きを止めないよう、ロックを取らずに読み取り専用の別接続を使う
+        # （WALモードのため、書き込み中でもコミット済みのデータを読める）
+        with closing(sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True)) as conn:
+            cursor = conn.execute(query, params)
+            
+            first_row = cursor.fetchone()
+            if first_row is None:
+                logger.warning("エクスポートする物件がありません")
+                return
+            
+            output_path = Path(output_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            with open(output_path, 'w', newline='', encoding='utf-8-sig') as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(fieldnames)
+                writer.writerow(first_row)
+                count = 1
+                # 1000行ずつ書き出す（メモリ使用量は一定のまま）
+                while True:
+                    rows = cursor.fetchmany(1000)
+                    if not rows:
+                        break
+                    writer.writerows(rows)
+                    count += len(rows)
         
-        logger.info(f"CSVファイルを出力しました: {output_path} ({len(properties)}件)")
\ No newline at end of file
+        logger.info(f"CSVファイルを出力しました: {output_path} ({count}件)")
@@ -0,0 +1,32 @@
+"""
+物件ID生成モジュール
+HTTP版・Selenium版のスクレイパーで同じURLから同じ物件IDを生成する
+"""
+import re
+import hashlib
+from functools import lru_cache
+from urllib.parse import urlparse
+
+# URLパス中の数値部分（物件番号）
+_RE_ID_PATH = re.compile(r'/(\d+)')
+
+
+@lru_cache(maxsize=4096)
+def extract_property_id(url: str) -> str:
+    """
+    URLから物件IDを抽出
+    
+    Args:
+        url: 物件URL
+    
+    Returns:
+        物件ID
+    """
+    # URLパスから数値部分を抽出
+    path = urlparse(url).path
+    id_match = _RE_ID_PATH.search(path)
+    if id_match:
+        return f"athome_{id_match.group(1)}"
+    
+    # フォールバック：URLのハッシュ値（既存データと同じIDになるようmd5の先頭10桁）
+    return f"athome_{hashlib.md5(url.encode()).hexdigest()[:10]}"
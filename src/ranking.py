@@ -3,42 +3,127 @@
 価格、立地、面積、投資価値の4軸で総合評価
 """
 import re
-from typing import Dict, Optional, Tuple
+from bisect import bisect_left, bisect_right
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
 import logging
 
+import numpy as np
+
+if TYPE_CHECKING:
+    from config.athome_scraper_config import ScraperConfig
+
 logger = logging.getLogger(__name__)
 
+# 用途地域のスコア（近隣商業を商業より先に照合する）
+_USAGE_SCORES = {
+    '近隣商業': 80,
+    '商業': 90,
+    '準工業': 70,
+    '第一種住居': 60,
+    '第二種住居': 60,
+    '第一種低層': 40,
+    '第二種低層': 40,
+}
+_USAGE_RE = re.compile('|'.join(_USAGE_SCORES))
+
+# 数値抽出用（桁区切りのカンマを除去してから照合）
+_NUM_TRANS = str.maketrans('', '', ',')
+_NUM_RE = re.compile(r'\d+(?:\.\d+)?')
+
+# 一括評価で配列化する数値項目（walk_minutes のみNoneを「駅情報なし」として扱う）
+_NUMERIC_FIELDS = ('price_numeric', 'land_area_tsubo', 'building_coverage', 'floor_area_ratio')
+
+# 二分探索用の評価テーブル: (昇順の閾値, スコア)
+_Ladder = Tuple[Tuple[float, ...], Tuple[float, ...]]
+
+
+def _upper_ladder(ladder: Sequence[Tuple[float, float]], default: float) -> _Ladder:
+    """
+    「閾値以下ならスコア」の評価テーブルを二分探索用に変換
+    
+    Args:
+        ladder: 閾値の昇順に並んだ (閾値, スコア)
+        default: どの閾値も超える場合のスコア
+    
+    Returns:
+        scores[bisect_left(thresholds, value)] で引けるテーブル
+    """
+    thresholds = tuple(threshold for threshold, _ in ladder)
+    scores = tuple(score for _, score in ladder) + (default,)
+    return thresholds, scores
+
+
+def _lower_ladder(ladder: Sequence[Tuple[float, float]], default: float) -> _Ladder:
+    """
+    「閾値以上ならスコア」の評価テーブルを二分探索用に変換
+    
+    Args:
+        ladder: 閾値の降順に並んだ (閾値, スコア)
+        default: どの閾値にも届かない場合のスコア
+    
+    Returns:
+        scores[bisect_right(thresholds, value)] で引けるテーブル
+    """
+    thresholds = tuple(threshold for threshold, _ in reversed(ladder))
+    scores = (default,) + tuple(score for _, score in reversed(ladder))
+    return thresholds, scores
+
+
+def _ladder_arrays(ladder: _Ladder) -> Tuple[np.ndarray, np.ndarray]:
+    """評価テーブルを np.searchsorted 用の (閾値, スコア) 配列に変換"""
+    thresholds, scores = ladder
+    return np.array(thresholds, dtype=float), np.array(scores, dtype=float)
+
+
+def _is_plain_number(value) -> bool:
+    """一括評価の配列にそのまま入れられる値か（int・float、boolは除く）"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
 
 class PropertyRanker:
     """物件ランク付けクラス"""
     
-    def __init__(self, config: Dict):
+    def __init__(self, config: 'ScraperConfig'):
         """
         ランク付けエンジンを初期化
         
         Args:
-            config: 設定辞書
+            config: 設定オブジェクト
         """
-        self.rank_thresholds = config.get('RANK_THRESHOLDS', {
-            "S": 90, "A": 80, "B": 70, "C": 60, "D": 0
-        })
-        self.weights = config.get('RANKING_WEIGHTS', {
-            "price": 0.30,
-            "location": 0.30,
-            "area": 0.20,
-            "investment": 0.20
-        })
-        self.price_criteria = config.get('PRICE_CRITERIA', {
-            "excellent": 10, "very_good": 15, "good": 20, "fair": 25, "poor": 30
-        })
-        self.premium_areas = config.get('PREMIUM_AREAS', [])
-        self.station_criteria = config.get('STATION_DISTANCE_CRITERIA', {
-            "excellent": 5, "very_good": 10, "good": 15, "fair": 20, "poor": 30
-        })
-        self.area_criteria = config.get('AREA_CRITERIA', {
-            "excellent": 100, "very_good": 70, "good": 50, "fair": 30, "poor": 20
-        })
-        self.investment_criteria = config.get('INVESTMENT_CRITERIA', {})
+        self.rank_thresholds = config.rank_thresholds
+        self.weights = config.ranking_weights
+        self.price_criteria = config.price_criteria
+        self.premium_areas = config.premium_areas
+        
+        # プレミアムエリアを1つの正規表現にまとめる（住所を1回走査するだけで判定できる）
+        self._premium_area_re = re.compile(
+            '|'.join(re.escape(area) for area in sorted(self.premium_areas, key=len, reverse=True))
+        ) if self.premium_areas else None
+        self.station_criteria = config.station_distance_criteria
+        self.area_criteria = config.area_criteria
+        self.investment_criteria = config.investment_criteria
+        
+        # 二分探索用の評価テーブル
+        self._price_ladder = _upper_ladder(config.price_criteria_sorted, 10)
+        self._station_ladder = _upper_ladder(config.station_distance_criteria_sorted, 10)
+        self._area_ladder = _lower_ladder(config.area_criteria_sorted, 10)
+        self._investment_ladders = {
+            key: _lower_ladder(ladder, 50)
+            for key, ladder in config.investment_criteria_sorted.items()
+        }
+        
+        # 一括評価用: 評価テーブルのNumPy配列
+        self._price_arrays = _ladder_arrays(self._price_ladder)
+        self._station_arrays = _ladder_arrays(self._station_ladder)
+        self._area_arrays = _ladder_arrays(self._area_ladder)
+        self._investment_arrays = {
+            key: _ladder_arrays(ladder) for key, ladder in self._investment_ladders.items()
+        }
+        
+        # 一括評価用: ランク閾値（昇順）と対応するランク
+        grades = sorted(self.rank_thresholds.items(), key=lambda item: item[1])
+        self._grade_thresholds = np.array([threshold for _, threshold in grades], dtype=float)
+        self._grade_labels = np.array(['D'] + [grade for grade, _ in grades])
     
     def calculate_rank(self, property_data: Dict) -> Dict:
         """
@@ -80,6 +165,149 @@ class PropertyRanker:
         
         return result
     
+    def calculate_ranks(self, rows: List[Dict]) -> List[Dict]:
+        """
+        複数物件のランクを一括計算
+        
+        数値項目の評価をNumPyでまとめて行う。結果は calculate_rank と同一
+        
+        Args:
+            rows: 物件データのリスト
+        
+        Returns:
+            各物件のランク情報の辞書のリスト（rowsと同じ順序）
+        """
+        results: List[Optional[Dict]] = [None] * len(rows)
+        
+        # 数値項目が数値の物件のみ一括評価し、それ以外は1件ずつ評価（例外時の既定値を揃えるため）
+        batch = []
+        for i, row in enumerate(rows):
+            if all(_is_plain_number(row.get(field, 0)) for field in _NUMERIC_FIELDS) \
+                    and (row.get('walk_minutes') is None or _is_plain_number(row['walk_minutes'])) \
+                    and isinstance(row.get('address', ''), str) \
+                    and isinstance(row.get('usage_area', ''), str):
+                batch.append(i)
+            else:
+                results[i] = self.calculate_rank(rows[i])
+        
+        if batch:
+            batch_rows = [rows[i] for i in batch]
+            for i, result in zip(batch, self._calculate_ranks_vectorized(batch_rows)):
+                results[i] = result
+        
+        return results
+    
+    def _calculate_ranks_vectorized(self, rows: List[Dict]) -> List[Dict]:
+        """
+        数値項目が揃った物件のランクを一括計算
+        
+        Args:
+            rows: 物件データのリスト
+        
+        Returns:
+            各物件のランク情報の辞書のリスト
+        """
+        def column(field: str) -> np.ndarray:
+            return np.array([row.get(field, 0) for row in rows], dtype=float)
+        
+        price_numeric = column('price_numeric')
+        land_area_tsubo = column('land_area_tsubo')
+        building_coverage = column('building_coverage')
+        floor_area_ratio = column('floor_area_ratio')
+        walk_known = np.array([row.get('walk_minutes') is not None for row in rows])
+        walk_minutes = np.array([row.get('walk_minutes') or 0 for row in rows], dtype=float)
+        
+        # 価格評価（坪単価ベース、データ不足は50点）
+        has_price = (price_numeric > 0) & (land_area_tsubo > 0)
+        price_per_tsubo = np.divide(price_numeric, land_area_tsubo,
+                                    out=np.zeros_like(price_numeric), where=has_price)
+        price_score = np.where(
+            has_price, self._lookup_ladder(self._price_arrays, price_per_tsubo, 'left'), 50.0
+        )
+        
+        # 立地評価（エリア50% + 駅距離50%、駅情報なしは30点）
+        area_bonus = np.array([self._premium_area_score(row.get('address', '')) for row in rows],
+                              dtype=float)
+        station_score = np.where(
+            walk_known, self._lookup_ladder(self._station_arrays, walk_minutes, 'left'), 30.0
+        )
+        location_score = area_bonus * 0.5 + station_score * 0.5
+        
+        # 面積評価（データなしは30点）
+        area_score = np.where(
+            land_area_tsubo > 0, self._lookup_ladder(self._area_arrays, land_area_tsubo, 'right'), 30.0
+        )
+        
+        # 投資価値評価（建ぺい率・容積率は値がある場合のみ平均に含める）
+        has_coverage = building_coverage > 0
+        has_ratio = floor_area_ratio > 0
+        coverage_score = self._lookup_investment_array('建ぺい率', building_coverage)
+        ratio_score = self._lookup_investment_array('容積率', floor_area_ratio)
+        usage_score = np.array([self._usage_score(row.get('usage_area', '')) for row in rows],
+                               dtype=float)
+        investment_score = (
+            np.where(has_coverage, coverage_score, 0.0) +
+            np.where(has_ratio, ratio_score, 0.0) +
+            usage_score
+        ) / (1 + has_coverage.astype(int) + has_ratio.astype(int))
+        
+        # 重み付き総合スコア（calculate_rank と同じ順序で加算）
+        total_score = (
+            price_score * self.weights['price'] +
+            location_score * self.weights['location'] +
+            area_score * self.weights['area'] +
+            investment_score * self.weights['investment']
+        )
+        grades = self._grade_labels[np.searchsorted(self._grade_thresholds, total_score, side='right')]
+        
+        return [
+            {
+                'ranking_score': round(total, 2),
+                'ranking_grade': str(grade),
+                'price_evaluation': round(price, 2),
+                'location_evaluation': round(location, 2),
+                'area_evaluation': round(area, 2),
+                'investment_evaluation': round(investment, 2)
+            }
+            for total, grade, price, location, area, investment in zip(
+                total_score.tolist(), grades, price_score.tolist(), location_score.tolist(),
+                area_score.tolist(), investment_score.tolist()
+            )
+        ]
+    
+    @staticmethod
+    def _lookup_ladder(arrays: Tuple[np.ndarray, np.ndarray], values: np.ndarray,
+                       side: str) -> np.ndarray:
+        """
+        評価テーブルからスコアを一括で引く
+        
+        Args:
+            arrays: 評価テーブルの (閾値, スコア) 配列
+            values: 評価値の配列
+            side: 'left'（閾値以下）または 'right'（閾値以上）
+        
+        Returns:
+            スコアの配列
+        """
+        thresholds, scores = arrays
+        return scores[np.searchsorted(thresholds, values, side=side)]
+    
+    def _lookup_investment_array(self, key: str, values: np.ndarray) -> np.ndarray:
+        """
+        投資価値の評価テーブルからスコアを一括で引く
+        
+        Args:
+            key: 評価項目（建ぺい率、容積率）
+            values: 評価値の配列
+        
+        Returns:
+            スコアの配列（テーブルがない場合は50）
+        """
+        arrays = self._investment_arrays.get(key)
+        if arrays is None:
+            return np.full_like(values, 50.0)
+        return self._lookup_ladder(arrays, values, 'right')
+    
     def _evaluate_price(self, property_data: Dict) -> float:
         """
         価格評価（坪単価ベース）
@@ -101,18 +329,8 @@ class PropertyRanker:
             price_per_tsubo = price_numeric / land_area_tsubo
             
             # スコアを計算
-            if price_per_tsubo <= self.price_criteria['excellent']:
-                score = 100
-            elif price_per_tsubo <= self.price_criteria['very_good']:
-                score = 80
-            elif price_per_tsubo <= self.price_criteria['good']:
-                score = 60
-            elif price_per_tsubo <= self.price_criteria['fair']:
-                score = 40
-            elif price_per_tsubo <= self.price_criteria['poor']:
-                score = 20
-            else:
-                score = 10
+            thresholds, scores = self._price_ladder
+            score = scores[bisect_left(thresholds, price_per_tsubo)]
             
             logger.debug(f"価格評価: 坪単価{price_per_tsubo:.1f}万円 → {score}点")
             return float(score)
@@ -136,27 +354,12 @@ class PropertyRanker:
             walk_minutes = property_data.get('walk_minutes', None)
             
             # エリア評価（50%）
-            area_score = 50  # デフォルト
-            for premium_area in self.premium_areas:
-                if premium_area in address:
-                    area_score = 100
-                    logger.debug(f"プレミアムエリア: {premium_area}")
-                    break
+            area_score = self._premium_area_score(address)
             
             # 駅距離評価（50%）
             if walk_minutes is not None:
-                if walk_minutes <= self.station_criteria['excellent']:
-                    station_score = 100
-                elif walk_minutes <= self.station_criteria['very_good']:
-                    station_score = 80
-                elif walk_minutes <= self.station_criteria['good']:
-                    station_score = 60
-                elif walk_minutes <= self.station_criteria['fair']:
-                    station_score = 40
-                elif walk_minutes <= self.station_criteria['poor']:
-                    station_score = 20
-                else:
-                    station_score = 10
+                thresholds, scores = self._station_ladder
+                station_score = scores[bisect_left(thresholds, walk_minutes)]
             else:
                 station_score = 30  # 駅情報なしの場合
             
@@ -187,18 +390,8 @@ class PropertyRanker:
                 return 30.0  # データなしの場合
             
             # スコアを計算
-            if land_area_tsubo >= self.area_criteria['excellent']:
-                score = 100
-            elif land_area_tsubo >= self.area_criteria['very_good']:
-                score = 80
-            elif land_area_tsubo >= self.area_criteria['good']:
-                score = 60
-            elif land_area_tsubo >= self.area_criteria['fair']:
-                score = 40
-            elif land_area_tsubo >= self.area_criteria['poor']:
-                score = 20
-            else:
-                score = 10
+            thresholds, scores = self._area_ladder
+            score = scores[bisect_right(thresholds, land_area_tsubo)]
             
             logger.debug(f"面積評価: {land_area_tsubo:.1f}坪 → {score}点")
             return float(score)
@@ -226,36 +419,18 @@ class PropertyRanker:
             
             # 建ぺい率評価
             if building_coverage > 0:
-                coverage_score = 50  # デフォルト
-                for threshold, score in sorted(self.investment_criteria.get('建ぺい率', {}).items(), reverse=True):
-                    if building_coverage >= threshold:
-                        coverage_score = score
-                        break
+                coverage_score = self._lookup_investment('建ぺい率', building_coverage)
                 scores.append(coverage_score)
                 logger.debug(f"建ぺい率{building_coverage}% → {coverage_score}点")
             
             # 容積率評価
             if floor_area_ratio > 0:
-                ratio_score = 50  # デフォルト
-                for threshold, score in sorted(self.investment_criteria.get('容積率', {}).items(), reverse=True):
-                    if floor_area_ratio >= threshold:
-                        ratio_score = score
-                        break
+                ratio_score = self._lookup_investment('容積率', floor_area_ratio)
                 scores.append(ratio_score)
                 logger.debug(f"容積率{floor_area_ratio}% → {ratio_score}点")
             
             # 用途地域評価
-            usage_score = 50  # デフォルト
-            if '商業' in usage_area:
-                usage_score = 90
-            elif '近隣商業' in usage_area:
-                usage_score = 80
-            elif '準工業' in usage_area:
-                usage_score = 70
-            elif '第一種住居' in usage_area or '第二種住居' in usage_area:
-                usage_score = 60
-            elif '第一種低層' in usage_area or '第二種低層' in usage_area:
-                usage_score = 40
+            usage_score = self._usage_score(usage_area)
             
             scores.append(usage_score)
             logger.debug(f"用途地域: {usage_area} → {usage_score}点")
@@ -271,6 +446,53 @@ class PropertyRanker:
             logger.warning(f"投資価値評価でエラー: {e}")
             return 50.0
     
+    def _premium_area_score(self, address: str) -> int:
+        """
+        住所からエリアスコアを判定
+        
+        Args:
+            address: 住所
+        
+        Returns:
+            プレミアムエリアなら100、それ以外は50
+        """
+        match = self._premium_area_re.search(address) if self._premium_area_re else None
+        if match:
+            logger.debug(f"プレミアムエリア: {match.group()}")
+            return 100
+        return 50  # デフォルト
+    
+    @staticmethod
+    def _usage_score(usage_area: str) -> int:
+        """
+        用途地域からスコアを判定
+        
+        Args:
+            usage_area: 用途地域
+        
+        Returns:
+            用途地域スコア
+        """
+        match = _USAGE_RE.search(usage_area)
+        return _USAGE_SCORES[match.group()] if match else 50  # デフォルト
+    
+    def _lookup_investment(self, key: str, value: float) -> float:
+        """
+        投資価値の評価テーブルからスコアを引く
+        
+        Args:
+            key: 評価項目（建ぺい率、容積率）
+            value: 評価値
+        
+        Returns:
+            スコア（テーブルがない場合は50）
+        """
+        ladder = self._investment_ladders.get(key)
+        if ladder is None:
+            return 50  # デフォルト
+        thresholds, scores = ladder
+        return scores[bisect_right(thresholds, value)]
+    
     def _determine_grade(self, total_score: float) -> str:
         """
         総合スコアからランクを判定
@@ -286,13 +508,13 @@ class PropertyRanker:
                 return grade
         return 'D'
     
-    def parse_numeric_value(self, text: str, pattern: str = r'[\d,]+') -> Optional[float]:
+    def parse_numeric_value(self, text: str, pattern: Optional[str] = None) -> Optional[float]:
         """
         テキストから数値を抽出
         
         Args:
             text: 対象テキスト
-            pattern: 抽出パターン
+            pattern: 抽出パターン（省略時は小数を含む数値）
         
         Returns:
             抽出した数値
@@ -301,7 +523,8 @@ class PropertyRanker:
             return None
         
         try:
-            match = re.search(pattern, text.replace(',', ''))
+            number_re = _NUM_RE if pattern is None else re.compile(pattern)
+            match = number_re.search(text.translate(_NUM_TRANS))
             if match:
                 return float(match.group())
         except:
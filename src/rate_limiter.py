@@ -0,0 +1,31 @@
+"""
+リクエスト間隔制御モジュール
+複数スレッドからのリクエストを一定間隔に揃える
+"""
+import time
+import threading
+
+
+class RateLimiter:
+    """スレッド間で共有するリクエスト間隔制御"""
+    
+    def __init__(self, interval: float):
+        """
+        レートリミッターを初期化
+        
+        Args:
+            interval: リクエスト開始間隔（秒）
+        """
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+    
+    def wait(self):
+        """次のリクエスト枠まで待機"""
+        with self._lock:
+            now = time.monotonic()
+            scheduled = max(now, self._next_time)
+            self._next_time = scheduled + self.interval
+        
+        if scheduled > now:
+            time.sleep(scheduled - now)
@@ -4,71 +4,288 @@ Selenium版 Athome Property Scraper
 """
 import re
 import time
+import random
+import atexit
+import signal
 import logging
+import threading
+from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
+from functools import cached_property
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Union
 from urllib.parse import urljoin
 
+import requests
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import SessionNotCreatedException, TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+from lxml import etree, html as lhtml
+from lxml.cssselect import CSSSelector
+
+try:
+    import psutil
+except ImportError:  # psutil未導入時はChromeの子プロセスの後始末を driver.quit() に任せる
+    psutil = None
 
 from .database import PropertyDatabase
 from .ranking import PropertyRanker
+from .property_id import extract_property_id
+from .rate_limiter import RateLimiter
+from .batch_saver import BatchSaver, fetch_and_save
+
+if TYPE_CHECKING:
+    from config.athome_scraper_config import ScraperConfig
 
 logger = logging.getLogger(__name__)
 
+# 物件詳細の抽出パターン
+_RE_PRICE = re.compile(r'([\d,]+)\s*万円')
+_RE_M2 = re.compile(r'([\d,]+\.?\d*)\s*(?:m2|㎡)')
+_RE_TSUBO = re.compile(r'([\d,]+\.?\d*)\s*坪')
+_RE_WALK = re.compile(r'徒歩\s*(\d+)\s*分')
+_RE_PCT = re.compile(r'(\d+)\s*[%％]')
+
+# CAPTCHAページの判定（ページ全体を小文字化せずに1回の走査で判定）
+_RE_CAPTCHA = re.compile(r'認証にご協力ください|captcha', re.IGNORECASE)
+
+# 物件詳細ページのCAPTCHA判定（本文の文言のみで判定し、reCAPTCHAのスクリプト等の「captcha」には反応しない）
+_DETAIL_CAPTCHA_XPATH = etree.XPath(
+    'boolean(//body//text()[not(ancestor::script)][contains(., "認証にご協力ください")])'
+)
+
+# HTML先頭のXML宣言（lxmlはencoding宣言付きの文字列を解析できないため除去）
+_RE_XML_DECL = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+# HTML先頭のmeta要素で宣言された文字コード
+_RE_META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w-]+)', re.IGNORECASE)
+
+# ブラウザとHTTPセッションで共通のUser-Agent（最新のChromeバージョン）
+_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36'
+
+# ブラウザ側で評価するセレクタ（一覧ページの物件リンク・次ページリンク、物件詳細ページのタイトル）
+_LISTING_SELECTOR = 'a[href*="/kodate/"], a[href*="/tochi/"], .property-item a, .item-title a'
+_NEXT_PAGE_SELECTOR = 'a.next-page, .pagination .next a, a[rel="next"]'
+_DETAIL_READY_SELECTOR = 'h1'
+
+# 一覧ページのセレクタ（物件リンクが見つからない場合のフォールバック、lxmlで評価）
+_SEL_PROPERTY_LINKS = CSSSelector(
+    'a[href*="/kodate/"], a[href*="/tochi/"], a[href*="/bukken/"], a[href*="/detail/"]'
+)
+
+# 物件詳細ページのセレクタ（XPathへの変換は起動時に1回だけ）
+_SEL_TITLE = CSSSelector('h1, .property-title, .bukken-title, .item-title')
+_SEL_PRICE = CSSSelector('.price, .kakaku, [class*="price"]')
+_SEL_ADDRESS = CSSSelector('.address, .jusho, [class*="address"], .item-address')
+_SEL_AREA = CSSSelector('[class*="area"], [class*="menseki"], .land-area')
+_SEL_STATION = CSSSelector('[class*="station"], [class*="eki"], .access')
+_SEL_COVERAGE = CSSSelector('[class*="kenpei"], .building-coverage')
+_SEL_RATIO = CSSSelector('[class*="yoseki"], .floor-area-ratio')
+_SEL_USAGE = CSSSelector('[class*="youto"], [class*="chiiki"], .usage-area')
+_SEL_IMAGES = CSSSelector('.property-image img, .bukken-image img, [class*="photo"] img')
+
+# 物件リンクが現れたか、ページの読み込みが完了したか（CAPTCHAや物件のないページで待ち続けないため）
+_LISTING_READY_JS = (
+    "return document.querySelector(arguments[0]) !== null || document.readyState === 'complete';"
+)
+
+# 一覧ページの物件リンクのURLを1回の通信でまとめて取得するスクリプト
+_COLLECT_HREFS_JS = (
+    "return Array.from(document.querySelectorAll(arguments[0]), a => a.href).filter(Boolean);"
+)
+
+# ブラウザで読み込まないリソース（画像URLはHTMLから取得するため本体は不要）
+_BLOCKED_RESOURCE_URLS = [
+    '*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.svg',
+    '*.woff', '*.woff2', '*.ttf', '*.mp4', '*.css',
+]
+
+# 解決済みChromeDriverのパスのキャッシュ（バージョン確認の通信を省略）
+_CHROMEDRIVER_CACHE = Path('~/.cache/athome_scraper/chromedriver_path').expanduser()
+_CHROMEDRIVER_CACHE_TTL = 7 * 24 * 3600  # 秒
+
+
+def _parse_html(page_source: Union[str, bytes], encoding: Optional[str] = None):
+    """
+    HTMLをlxmlの要素ツリーに変換
+    
+    Args:
+        page_source: ページのHTML（ブラウザのページソース、またはHTTPで取得したバイト列）
+        encoding: バイト列の文字コード
+    
+    Returns:
+        ルート要素
+    """
+    if isinstance(page_source, bytes):
+        return lhtml.fromstring(page_source, parser=lhtml.HTMLParser(encoding=encoding))
+    return lhtml.fromstring(_RE_XML_DECL.sub('', page_source, count=1))
+
+
+def _detect_charset(response: requests.Response) -> str:
+    """
+    HTTP応答の文字コードを判定（Content-Typeのcharset → HTML先頭のmeta宣言 → UTF-8 の順）
+    
+    requestsはcharsetのないtext/htmlをISO-8859-1とみなすため、response.text は使わない
+    
+    Args:
+        response: HTTP応答
+    
+    Returns:
+        文字コード名
+    """
+    if 'charset' in response.headers.get('Content-Type', '').lower():
+        return response.encoding
+    meta_match = _RE_META_CHARSET.search(response.content, 0, 2048)
+    return meta_match.group(1).decode('ascii') if meta_match else 'utf-8'
+
+
+def _first_text(tree, selector: CSSSelector) -> Optional[str]:
+    """
+    セレクタに最初に一致した要素のテキストを取得
+    
+    Args:
+        tree: 検索対象の要素
+        selector: コンパイル済みセレクタ
+    
+    Returns:
+        前後の空白を除いたテキスト（一致しない場合はNone）
+    """
+    elements = selector(tree)
+    if not elements:
+        return None
+    return ''.join(text.strip() for text in elements[0].itertext())
+
+
+def _chromedriver_path(refresh: bool = False) -> str:
+    """
+    ChromeDriverのパスを取得（有効期限内のキャッシュがあれば再利用）
+    
+    Args:
+        refresh: キャッシュを無視して再取得する場合True
+    
+    Returns:
+        ChromeDriver実行ファイルのパス
+    """
+    if not refresh:
+        try:
+            if time.time() - _CHROMEDRIVER_CACHE.stat().st_mtime < _CHROMEDRIVER_CACHE_TTL:
+                driver_path = _CHROMEDRIVER_CACHE.read_text(encoding='utf-8').strip()
+                if driver_path and Path(driver_path).is_file():
+                    return driver_path
+        except OSError:
+            pass
+    
+    driver_path = ChromeDriverManager().install()
+    try:
+        _CHROMEDRIVER_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        _CHROMEDRIVER_CACHE.write_text(driver_path, encoding='utf-8')
+    except OSError as e:
+        logger.debug(f"ChromeDriverのパスを保存できません: {e}")
+    return driver_path
+
+
+# 起動済みWebDriverのプール（Chromeオプションごとに1つ、scrape_all の呼び出し間で再利用）
+_DRIVER_POOL: Dict[str, webdriver.Chrome] = {}
+# スクレイパーが使用中のWebDriver（異常終了時もプールと合わせて終了させる）
+_DRIVERS_IN_USE: Set[webdriver.Chrome] = set()
+_DRIVER_POOL_LOCK = threading.Lock()
+_SIGTERM_HANDLER_INSTALLED = False
+
+
+def _quit_driver(driver: webdriver.Chrome):
+    """WebDriverを終了（既に終了している場合のエラーは無視し、残ったChromeの子プロセスも終了）"""
+    children = []
+    if psutil is not None:
+        try:
+            children = psutil.Process(driver.service.process.pid).children(recursive=True)
+        except Exception:
+            pass  # chromedriverが既に終了している
+    
+    try:
+        driver.quit()
+    except Exception as e:
+        logger.debug(f"WebDriver終了時のエラー: {e}")
+    
+    for child in children:
+        try:
+            child.kill()
+        except psutil.Error:
+            pass  # 既に終了済み
+
+
+@atexit.register
+def shutdown_driver_pool():
+    """プールおよび使用中のWebDriverをすべて終了"""
+    with _DRIVER_POOL_LOCK:
+        drivers = list(_DRIVER_POOL.values()) + list(_DRIVERS_IN_USE)
+        _DRIVER_POOL.clear()
+        _DRIVERS_IN_USE.clear()
+    
+    for driver in drivers:
+        _quit_driver(driver)
+    
+    if drivers:
+        logger.info(f"WebDriverを{len(drivers)}件終了しました")
+
+
+def _exit_on_sigterm(signum, frame):
+    """SIGTERMを SystemExit に変換し、finally と atexit の後始末を実行させる"""
+    raise SystemExit(128 + signum)
+
+
+def _install_sigterm_handler():
+    """SIGTERMハンドラーを1回だけ登録（メインスレッドかつ既定の動作の場合のみ）"""
+    global _SIGTERM_HANDLER_INSTALLED
+    if _SIGTERM_HANDLER_INSTALLED or threading.current_thread() is not threading.main_thread():
+        return
+    if signal.getsignal(signal.SIGTERM) is signal.SIG_DFL:
+        signal.signal(signal.SIGTERM, _exit_on_sigterm)
+    _SIGTERM_HANDLER_INSTALLED = True
+
 
 class SeleniumAthomeScraper:
     """Selenium版Athome物件スクレイパークラス"""
     
-    def __init__(self, config: Dict):
+    def __init__(self, config: 'ScraperConfig'):
         """
         スクレイパーを初期化
         
         Args:
-            config: 設定辞書
+            config: 設定オブジェクト
         """
         self.config = config
-        self.base_url = config.get('ATHOME_BASE_URL', 'https://www.athome.co.jp')
-        self.search_url = config.get('ATHOME_SEARCH_URL')
-        self.scraping_config = config.get('SCRAPING_CONFIG', {})
+        self.base_url = config.base_url
+        self.search_url = config.search_url
+        self.scraping_config = config.scraping
         
-        # Chrome オプション設定（ボット検出を回避）
-        self.chrome_options = Options()
+        # SIGTERMでもWebDriverとChromeのプロセスが残らないよう後始末を保証
+        _install_sigterm_handler()
         
-        # 自動化検出を回避する設定
-        self.chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        self.chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        self.chrome_options.add_experimental_option('useAutomationExtension', False)
-        
-        # プロファイル設定（実際のユーザーのように見せる）
-        self.chrome_options.add_argument("--disable-gpu")
-        self.chrome_options.add_argument("--no-sandbox")
-        self.chrome_options.add_argument("--disable-dev-shm-usage")
-        self.chrome_options.add_argument("--disable-web-security")
-        self.chrome_options.add_argument("--disable-features=VizDisplayCompositor")
-        self.chrome_options.add_argument("--window-size=1920,1080")
-        self.chrome_options.add_argument("--start-maximized")
+        # Chrome オプション設定（通常はヘッドレス、CAPTCHAの手動解決時のみ画面表示あり）
+        self._headed_options = self._build_chrome_options(headless=False)
+        if self.scraping_config.get('headless', True):
+            self.chrome_options = self._build_chrome_options(headless=True)
+        else:
+            self.chrome_options = self._headed_options
         
-        # 言語設定
-        self.chrome_options.add_experimental_option('prefs', {
-            'intl.accept_languages': 'ja,en-US;q=0.9,en;q=0.8'
+        # 物件詳細はHTTPで直接取得し、CAPTCHAが出た場合のみブラウザを使用
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': _USER_AGENT,
+            'Accept-Language': 'ja,en-US;q=0.9,en;q=0.8',
+            'Connection': 'keep-alive'
         })
         
-        # User-Agent設定（最新のChromeバージョン）
-        user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36'
-        self.chrome_options.add_argument(f'user-agent={user_agent}')
+        # 並列取得用のレート制御とWebDriverの排他（WebDriverはスレッドセーフでないため）
+        self._rate_limiter = RateLimiter(self.scraping_config.get('request_delay', 2))
+        self._driver_lock = threading.Lock()
         
-        # データベースとランカーの初期化
-        db_path = config.get('DATABASE_CONFIG', {}).get('db_path', 'data/properties.db')
-        self.db = PropertyDatabase(db_path)
-        self.ranker = PropertyRanker(config)
+        # 一括保存の単位
+        self.batch_size = config.database.get('batch_size', 50)
         
         # スクレイピング統計
         self.stats = {
@@ -77,17 +294,87 @@ class SeleniumAthomeScraper:
             'total_properties': 0,
             'new_properties': 0,
             'updated_properties': 0,
+            'skipped_properties': 0,
             'errors': 0
         }
         
         self.driver = None
     
+    @staticmethod
+    def _build_chrome_options(headless: bool) -> Options:
+        """
+        Chromeオプションを生成（ボット検出を回避）
+        
+        Args:
+            headless: ヘッドレスで起動する場合True（画像の読み込みも無効化）
+        
+        Returns:
+            Chromeオプション
+        """
+        options = Options()
+        
+        # 自動化検出を回避する設定
+        options.add_argument('--disable-blink-features=AutomationControlled')
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option('useAutomationExtension', False)
+        
+        # プロファイル設定（実際のユーザーのように見せる）
+        options.add_argument("--disable-gpu")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-web-security")
+        options.add_argument("--disable-features=VizDisplayCompositor")
+        options.add_argument("--window-size=1920,1080")
+        if headless:
+            # 画面描画と画像のデコードを省略
+            options.add_argument("--headless=new")
+            options.add_argument("--blink-settings=imagesEnabled=false")
+        else:
+            options.add_argument("--start-maximized")
+        
+        # 言語設定
+        options.add_experimental_option('prefs', {
+            'intl.accept_languages': 'ja,en-US;q=0.9,en;q=0.8'
+        })
+        
+        # User-Agent設定（最新のChromeバージョン）
+        options.add_argument(f'user-agent={_USER_AGENT}')
+        return options
+    
+    def _driver_pool_key(self) -> str:
+        """WebDriverプールのキー（Chromeオプションが同じなら同じキー）"""
+        return repr((self.chrome_options.arguments, self.chrome_options.experimental_options))
+    
     def _init_driver(self):
-        """WebDriverを初期化"""
+        """WebDriverを初期化（プールに同じ設定のWebDriverがあれば再利用）"""
+        with _DRIVER_POOL_LOCK:
+            driver = _DRIVER_POOL.pop(self._driver_pool_key(), None)
+        
+        if driver is not None:
+            try:
+                driver.window_handles  # 生存確認
+                self.driver = driver
+                with _DRIVER_POOL_LOCK:
+                    _DRIVERS_IN_USE.add(driver)
+                logger.info("プールのWebDriverを再利用します")
+                return
+            except Exception:
+                logger.info("プールのWebDriverが終了していたため再起動します")
+                _quit_driver(driver)
+        
         try:
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=self.chrome_options)
-            self.driver.implicitly_wait(10)
+            # 暗黙の待機は設定しない（要素がない場合に毎回待たされるため、必要な箇所で明示的に待機）
+            try:
+                service = Service(_chromedriver_path())
+                self.driver = webdriver.Chrome(service=service, options=self.chrome_options)
+            except SessionNotCreatedException:
+                # Chromeの更新でキャッシュしたドライバーが合わなくなった場合は再取得
+                logger.info("キャッシュしたChromeDriverが使用できないため再取得します")
+                service = Service(_chromedriver_path(refresh=True))
+                self.driver = webdriver.Chrome(service=service, options=self.chrome_options)
+            
+            with _DRIVER_POOL_LOCK:
+                _DRIVERS_IN_USE.add(self.driver)
             
             # JavaScriptでボット検出を回避
             stealth_js = """
@@ -123,13 +410,56 @@ class SeleniumAthomeScraper:
             logger.error(f"WebDriver初期化エラー: {e}")
             raise
     
+    def _switch_to_headed(self):
+        """画面表示ありのWebDriverに切り替える（ヘッドレスで起動している場合のみ）"""
+        if self.chrome_options is self._headed_options:
+            return
+        
+        logger.info("CAPTCHAを解決するため画面表示ありのブラウザに切り替えます")
+        self._close_driver()
+        self.chrome_options = self._headed_options
+        self._init_driver()
+    
     def _close_driver(self):
-        """WebDriverを閉じる"""
-        if self.driver:
-            self.driver.quit()
-            self.driver = None
+        """WebDriverをプールに戻す（追加のタブは閉じる）"""
+        if not self.driver:
+            return
+        
+        driver, self.driver = self.driver, None
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+        except Exception as e:
+            logger.warning(f"WebDriverが応答しないため終了します: {e}")
+            _quit_driver(driver)
+            with _DRIVER_POOL_LOCK:
+                _DRIVERS_IN_USE.discard(driver)
+            return
+        
+        with _DRIVER_POOL_LOCK:
+            _DRIVERS_IN_USE.discard(driver)
+            pooled = _DRIVER_POOL.setdefault(self._driver_pool_key(), driver)
+        
+        if pooled is driver:
+            logger.info("WebDriverをプールに戻しました")
+        else:
+            # 同じ設定のWebDriverが既にプールにある場合は終了
+            _quit_driver(driver)
             logger.info("WebDriverを終了しました")
     
+    @cached_property
+    def db(self) -> PropertyDatabase:
+        """データベース（初回アクセス時に初期化）"""
+        return PropertyDatabase(self.config.database.get('db_path', 'data/properties.db'))
+    
+    @cached_property
+    def ranker(self) -> PropertyRanker:
+        """ランカー（初回アクセス時に初期化）"""
+        return PropertyRanker(self.config)
+    
     def scrape_all(self) -> Dict:
         """
         全物件をスクレイピング
@@ -143,45 +473,32 @@ class SeleniumAthomeScraper:
         try:
             # WebDriver初期化
             self._init_driver()
+            self._set_resource_blocking(True)
             
             # ページリストを取得
             property_urls = self._get_property_urls()
             logger.info(f"{len(property_urls)}件の物件URLを取得しました")
             
-            # 各物件の詳細を取得
-            active_property_ids = []
-            for i, url in enumerate(property_urls, 1):
-                try:
-                    logger.info(f"処理中: {i}/{len(property_urls)} - {url}")
-                    property_data = self._scrape_property_detail(url)
-                    
-                    if property_data:
-                        # ランク付け
-                        rank_info = self.ranker.calculate_rank(property_data)
-                        property_data.update(rank_info)
-                        
-                        # データベースに保存
-                        is_new, property_id = self.db.upsert_property(property_data)
-                        active_property_ids.append(property_id)
-                        
-                        if is_new:
-                            self.stats['new_properties'] += 1
-                            logger.info(f"新規物件: {property_data.get('title')} - {rank_info['ranking_grade']}級")
-                        else:
-                            self.stats['updated_properties'] += 1
-                        
-                        self.stats['total_properties'] += 1
-                    
-                    # リクエスト間隔
-                    time.sleep(self.scraping_config.get('request_delay', 2))
-                    
-                except Exception as e:
-                    logger.error(f"物件処理エラー: {url} - {e}")
-                    self.stats['errors'] += 1
-                    continue
+            # ブラウザで取得したクッキーをHTTPセッションに引き継ぐ
+            self._sync_session_cookies()
+            
+            # 最近取得済みの物件は詳細を再取得せず、アクティブなまま残す
+            recent = self.db.get_recent_urls(
+                property_urls, self.scraping_config.get('recrawl_ttl_hours', 24)
+            )
+            active_property_ids = list(recent.values())
+            self.stats['skipped_properties'] = len(recent)
+            if recent:
+                logger.info(f"{len(recent)}件は最近取得済みのためスキップします")
+                property_urls = [url for url in property_urls if url not in recent]
+            
+            # 各物件の詳細を並列取得（保存はメインスレッドで実施）
+            saver = BatchSaver(self.db, self.ranker, self.stats, self.batch_size, active_property_ids)
+            fetch_and_save(self._fetch_and_process, property_urls, saver,
+                           self.scraping_config.get('max_workers', 4))
             
             # 古い物件を非アクティブ化
-            deactivated = self.db.deactivate_old_properties(active_property_ids)
+            deactivated = self.db.deactivate_old_properties(saver.active_property_ids)
             
             # 統計を更新
             self.stats['end_time'] = datetime.now()
@@ -221,6 +538,19 @@ class SeleniumAthomeScraper:
         finally:
             self._close_driver()
     
+    def _fetch_and_process(self, url: str) -> Optional[Dict]:
+        """
+        物件詳細を取得（ランク付けは保存時にまとめて行う）
+        
+        Args:
+            url: 物件詳細URL
+        
+        Returns:
+            物件データ（取得失敗時はNone）
+        """
+        self._rate_limiter.wait()
+        return self._scrape_property_detail(url)
+    
     def _get_property_urls(self) -> List[str]:
         """
         物件URLのリストを取得
@@ -228,7 +558,7 @@ class SeleniumAthomeScraper:
         Returns:
             物件URLのリスト
         """
-        property_urls = []
+        property_urls = {}  # 挿入順を保ったまま重複を除去
         page = 1
         max_pages = self.scraping_config.get('max_pages', 10)
         
@@ -242,67 +572,68 @@ class SeleniumAthomeScraper:
                 
                 logger.info(f"ページ{page}を取得中: {url}")
                 
-                # ページを取得（ゆっくりとアクセス）
+                # ページを取得（固定のsleepではなく必要な要素の出現を待つ）
                 if page == 1:
                     # 最初はホームページにアクセスしてクッキーを取得
+                    self._rate_limiter.wait()
                     self.driver.get(self.base_url)
-                    time.sleep(3)  # 人間らしい待機時間
+                    self._wait_for_document_ready()
                 
+                # リクエスト間隔は前回の開始時刻から数える（処理時間と待機を重ねる）
+                self._rate_limiter.wait()
                 self.driver.get(url)
-                time.sleep(2)  # ページ読み込み待機
+                self._wait_for_listing()
                 
-                # スクロールして人間らしい動作をシミュレート
+                # スクロールして人間らしい動作をシミュレート（短いランダム間隔）
                 self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight * 0.3);")
-                time.sleep(1)
+                time.sleep(random.uniform(0.3, 0.8))
                 self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight * 0.6);")
-                time.sleep(1)
+                time.sleep(random.uniform(0.3, 0.8))
                 
                 # CAPTCHAチェック
-                page_source = self.driver.page_source
-                if "認証にご協力ください" in page_source or "captcha" in page_source.lower():
+                if self._is_captcha(self.driver.page_source):
                     logger.warning("CAPTCHA検出。手動で解決してください...")
+                    # ヘッドレスではパズルを操作できないため、画面表示ありで開き直す
+                    self._switch_to_headed()
+                    # パズル画像を表示するため、解決中はリソースの遮断を解除
+                    self._set_resource_blocking(False)
+                    self.driver.get(url)
                     logger.info("パズル認証を完了させてから、Enterキーを押してください")
                     input("解決したらEnter: ")
-                    # 解決後、ページを再読み込み
+                    self._set_resource_blocking(True)
+                    # 解決後、ページを再読み込みして物件リンクの出現を待つ
                     self.driver.refresh()
-                    time.sleep(3)
-                
-                # ページが完全に読み込まれるまで待機
-                wait = WebDriverWait(self.driver, 30)
+                    self._wait_for_listing()
                 
                 # 物件リンクを取得
-                property_elements = self.driver.find_elements(By.CSS_SELECTOR, 
-                    'a[href*="/kodate/"], a[href*="/tochi/"], .property-item a, .item-title a')
+                found_before = len(property_urls)
+                hrefs = self.driver.execute_script(_COLLECT_HREFS_JS, _LISTING_SELECTOR)
                 
-                if not property_elements:
+                if not hrefs:
                     logger.warning(f"ページ{page}で物件が見つかりません")
                     # ページソースを確認
-                    soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+                    tree = _parse_html(self.driver.page_source)
                     # より広範なセレクタで再検索
-                    links = soup.find_all('a', href=True)
-                    for link in links:
-                        href = link.get('href', '')
-                        if any(keyword in href for keyword in ['/kodate/', '/tochi/', '/bukken/', '/detail/']):
-                            full_url = urljoin(self.base_url, href)
-                            property_urls.append(full_url)
-                            logger.info(f"物件URL発見: {full_url}")
+                    for link in _SEL_PROPERTY_LINKS(tree):
+                        full_url = urljoin(self.base_url, link.get('href'))
+                        property_urls[full_url] = None
+                        logger.debug(f"物件URL発見: {full_url}")
                     
                     if not property_urls:
                         break
                 else:
                     # URLを収集
-                    for element in property_elements:
-                        href = element.get_attribute('href')
-                        if href:
-                            property_urls.append(href)
-                            logger.info(f"物件URL取得: {href}")
+                    for href in hrefs:
+                        property_urls[href] = None
+                        logger.debug(f"物件URL取得: {href}")
                 
-                logger.info(f"ページ{page}から{len(property_elements)}件の物件を取得")
+                logger.info(f"ページ{page}から{len(property_urls) - found_before}件の物件を取得")
                 
                 # 次のページボタンを探す
                 try:
-                    next_button = self.driver.find_element(By.CSS_SELECTOR, 
-                        'a.next-page, .pagination .next a, a[rel="next"]')
+                    next_button = WebDriverWait(self.driver, 2).until(EC.presence_of_element_located(
+                        (By.CSS_SELECTOR, _NEXT_PAGE_SELECTOR)
+                    ))
                     if not next_button.is_enabled() or (max_pages and page >= max_pages):
                         break
                 except:
@@ -310,20 +641,126 @@ class SeleniumAthomeScraper:
                     break
                 
                 page += 1
-                time.sleep(self.scraping_config.get('request_delay', 2))
                 
             except Exception as e:
                 logger.error(f"ページ取得エラー: ページ{page} - {e}")
                 break
         
-        # 重複を除去
-        property_urls = list(set(property_urls))
-        return property_urls
+        return list(property_urls)
+    
+    def _set_resource_blocking(self, enabled: bool):
+        """
+        画像・フォント・CSSの読み込みを遮断または再開（CDP）
+        
+        Args:
+            enabled: 遮断する場合True
+        """
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {
+                'urls': _BLOCKED_RESOURCE_URLS if enabled else []
+            })
+        except Exception as e:
+            logger.warning(f"リソース遮断の設定に失敗しました: {e}")
+    
+    def _wait_for_element(self, selector: str, timeout: float) -> bool:
+        """
+        指定したCSSセレクタの要素が現れるまで待機
+        
+        Args:
+            selector: CSSセレクタ
+            timeout: 最大待機秒数
+        
+        Returns:
+            要素が見つかった場合True（タイムアウト時はFalse）
+        """
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+            )
+            return True
+        except TimeoutException:
+            return False
+    
+    def _wait_for_listing(self, timeout: float = 10) -> bool:
+        """
+        一覧ページの物件リンクが現れるか、読み込みが完了するまで待機
+        
+        Args:
+            timeout: 最大待機秒数
+        
+        Returns:
+            待機条件を満たした場合True（タイムアウト時はFalse）
+        """
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                lambda d: d.execute_script(_LISTING_READY_JS, _LISTING_SELECTOR)
+            )
+            return True
+        except TimeoutException:
+            return False
+    
+    def _wait_for_document_ready(self, timeout: float = 10) -> bool:
+        """
+        ページの読み込み完了（document.readyState）まで待機
+        
+        Args:
+            timeout: 最大待機秒数
+        
+        Returns:
+            読み込みが完了した場合True（タイムアウト時はFalse）
+        """
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                lambda d: d.execute_script('return document.readyState') == 'complete'
+            )
+            return True
+        except TimeoutException:
+            return False
+    
+    def _is_captcha(self, page_source: str) -> bool:
+        """
+        CAPTCHAページかどうかを判定
+        
+        Args:
+            page_source: ページのHTML
+        
+        Returns:
+            CAPTCHAページならTrue
+        """
+        return _RE_CAPTCHA.search(page_source) is not None
+    
+    def _is_detail_captcha(self, tree) -> bool:
+        """
+        物件詳細ページがCAPTCHAページかどうかを判定
+        
+        本文の文言のみで判定する（通常の物件ページに埋め込まれたreCAPTCHAでは誤検出しない）
+        
+        Args:
+            tree: ページの要素ツリー
+        
+        Returns:
+            CAPTCHAページならTrue
+        """
+        return _DETAIL_CAPTCHA_XPATH(tree)
+    
+    def _sync_session_cookies(self):
+        """WebDriverのクッキーをHTTPセッションにコピー"""
+        if not self.driver:
+            return
+        
+        for cookie in self.driver.get_cookies():
+            self.session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain'), path=cookie.get('path', '/')
+            )
     
     def _scrape_property_detail(self, url: str) -> Optional[Dict]:
         """
         物件詳細をスクレイピング
         
+        静的HTMLをHTTPで取得し、CAPTCHAやブロックを検出した場合のみブラウザで取得する
+        
         Args:
             url: 物件詳細URL
         
@@ -331,127 +768,154 @@ class SeleniumAthomeScraper:
             物件データの辞書
         """
         try:
-            self.driver.get(url)
-            
-            # ページが完全に読み込まれるまで待機
-            wait = WebDriverWait(self.driver, 20)
-            
-            # BeautifulSoupでパース
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            response = self.session.get(url, timeout=self.scraping_config.get('timeout', 30))
             
-            # 物件IDを生成（URLから）
-            property_id = self._extract_property_id(url)
+            blocked = response.status_code in (403, 429)
+            if not blocked:
+                # 文字コード未指定の応答でも文字化けしないよう、バイト列のままlxmlに渡す
+                tree = _parse_html(response.content, _detect_charset(response))
+                blocked = self._is_detail_captcha(tree)
             
-            # 基本情報を抽出
-            data = {
-                'property_id': property_id,
-                'url': url,
-                'scraped_at': datetime.now().isoformat()
-            }
+            if blocked:
+                logger.info(f"HTTP取得がブロックされたためブラウザで取得します: {url}")
+                return self._scrape_property_detail_selenium(url)
             
-            # タイトル
-            title_elem = soup.select_one('h1, .property-title, .bukken-title, .item-title')
-            data['title'] = title_elem.get_text(strip=True) if title_elem else 'タイトルなし'
+            response.raise_for_status()
+            return self._parse_property_detail(url, tree)
             
-            # 価格
-            price_elem = soup.select_one('.price, .kakaku, [class*="price"]')
-            if price_elem:
-                price_text = price_elem.get_text(strip=True)
-                data['price'] = price_text
-                # 数値を抽出（万円）
-                price_match = re.search(r'([\d,]+)\s*万円', price_text)
-                if price_match:
-                    data['price_numeric'] = int(price_match.group(1).replace(',', ''))
-            
-            # 住所
-            address_elem = soup.select_one('.address, .jusho, [class*="address"], .item-address')
-            data['address'] = address_elem.get_text(strip=True) if address_elem else ''
-            
-            # 土地面積
-            area_elem = soup.select_one('[class*="area"], [class*="menseki"], .land-area')
-            if area_elem:
-                area_text = area_elem.get_text(strip=True)
-                data['land_area'] = area_text
+        except Exception as e:
+            logger.error(f"物件詳細取得エラー: {url} - {e}")
+            return None
+    
+    def _scrape_property_detail_selenium(self, url: str) -> Optional[Dict]:
+        """
+        物件詳細をブラウザでスクレイピング（HTTP取得できない場合のフォールバック）
+        
+        Args:
+            url: 物件詳細URL
+        
+        Returns:
+            物件データの辞書
+        """
+        try:
+            with self._driver_lock:
+                # ブラウザでの再取得もサイトへのリクエストとして間隔を空ける
+                self._rate_limiter.wait()
+                self.driver.get(url)
                 
-                # 平米を抽出
-                m2_match = re.search(r'([\d,]+\.?\d*)\s*(?:m2|㎡)', area_text)
-                if m2_match:
-                    land_area_m2 = float(m2_match.group(1).replace(',', ''))
-                    data['land_area_m2'] = land_area_m2
-                    data['land_area_tsubo'] = land_area_m2 / 3.305785  # 坪に変換
+                # タイトルが表示されるまで待機（見つからなくてもそのまま解析）
+                self._wait_for_element(_DETAIL_READY_SELECTOR, timeout=5)
                 
-                # 坪を直接抽出
-                tsubo_match = re.search(r'([\d,]+\.?\d*)\s*坪', area_text)
-                if tsubo_match:
-                    data['land_area_tsubo'] = float(tsubo_match.group(1).replace(',', ''))
-            
-            # 最寄駅
-            station_elem = soup.select_one('[class*="station"], [class*="eki"], .access')
-            if station_elem:
-                station_text = station_elem.get_text(strip=True)
-                data['nearest_station'] = station_text
+                page_source = self.driver.page_source
                 
-                # 徒歩時間を抽出
-                walk_match = re.search(r'徒歩\s*(\d+)\s*分', station_text)
-                if walk_match:
-                    data['walk_time'] = f"徒歩{walk_match.group(1)}分"
-                    data['walk_minutes'] = int(walk_match.group(1))
+                # ブラウザで更新されたクッキーを以降のHTTP取得に反映
+                self._sync_session_cookies()
             
-            # 建ぺい率・容積率
-            coverage_elem = soup.select_one('[class*="kenpei"], .building-coverage')
-            if coverage_elem:
-                coverage_text = coverage_elem.get_text(strip=True)
-                coverage_match = re.search(r'(\d+)\s*[%％]', coverage_text)
-                if coverage_match:
-                    data['building_coverage'] = float(coverage_match.group(1))
+            tree = _parse_html(page_source)
+            if self._is_detail_captcha(tree):
+                logger.warning(f"ブラウザでもCAPTCHAが表示されたためスキップします: {url}")
+                return None
             
-            ratio_elem = soup.select_one('[class*="yoseki"], .floor-area-ratio')
-            if ratio_elem:
-                ratio_text = ratio_elem.get_text(strip=True)
-                ratio_match = re.search(r'(\d+)\s*[%％]', ratio_text)
-                if ratio_match:
-                    data['floor_area_ratio'] = float(ratio_match.group(1))
-            
-            # 用途地域
-            usage_elem = soup.select_one('[class*="youto"], [class*="chiiki"], .usage-area')
-            data['usage_area'] = usage_elem.get_text(strip=True) if usage_elem else ''
-            
-            # 画像URL
-            image_urls = []
-            for img in soup.select('.property-image img, .bukken-image img, [class*="photo"] img'):
-                img_url = img.get('src') or img.get('data-src')
-                if img_url:
-                    image_urls.append(urljoin(self.base_url, img_url))
-            data['image_urls'] = image_urls[:5]  # 最大5枚
-            
-            # 生データを保存（デバッグ用）
-            data['raw_data'] = {
-                'title': data.get('title'),
-                'price': data.get('price'),
-                'address': data.get('address')
-            }
-            
-            return data
+            return self._parse_property_detail(url, tree)
             
         except Exception as e:
-            logger.error(f"物件詳細取得エラー: {url} - {e}")
+            logger.error(f"物件詳細取得エラー（ブラウザ）: {url} - {e}")
             return None
     
-    def _extract_property_id(self, url: str) -> str:
+    def _parse_property_detail(self, url: str, tree) -> Dict:
         """
-        URLから物件IDを抽出
+        物件詳細ページの要素ツリーから物件データを抽出
         
         Args:
-            url: 物件URL
+            url: 物件詳細URL
+            tree: ページの要素ツリー
         
         Returns:
-            物件ID
+            物件データの辞書
         """
-        # URLパスから数値部分を抽出
-        id_match = re.search(r'/(\d+)(?:/|$|\?)', url)
-        if id_match:
-            return f"athome_{id_match.group(1)}"
-        
-        # フォールバック：URLのハッシュ値
-        import hashlib
-        return f"athome_{hashlib.md5(url.encode()).hexdigest()[:10]}"
\ No newline at end of file
+        # 物件IDを生成（URLから）
+        property_id = extract_property_id(url)
+        
+        # 基本情報を抽出
+        data = {
+            'property_id': property_id,
+            'url': url,
+            'scraped_at': int(time.time())
+        }
+        
+        # タイトル
+        title_text = _first_text(tree, _SEL_TITLE)
+        data['title'] = title_text if title_text is not None else 'タイトルなし'
+        
+        # 価格
+        price_text = _first_text(tree, _SEL_PRICE)
+        if price_text is not None:
+            data['price'] = price_text
+            # 数値を抽出（万円）
+            price_match = _RE_PRICE.search(price_text)
+            if price_match:
+                data['price_numeric'] = int(price_match.group(1).replace(',', ''))
+        
+        # 住所
+        data['address'] = _first_text(tree, _SEL_ADDRESS) or ''
+        
+        # 土地面積
+        area_text = _first_text(tree, _SEL_AREA)
+        if area_text is not None:
+            data['land_area'] = area_text
+            
+            # 平米を抽出
+            m2_match = _RE_M2.search(area_text)
+            if m2_match:
+                land_area_m2 = float(m2_match.group(1).replace(',', ''))
+                data['land_area_m2'] = land_area_m2
+                data['land_area_tsubo'] = land_area_m2 / 3.305785  # 坪に変換
+            
+            # 坪を直接抽出
+            tsubo_match = _RE_TSUBO.search(area_text)
+            if tsubo_match:
+                data['land_area_tsubo'] = float(tsubo_match.group(1).replace(',', ''))
+        
+        # 最寄駅
+        station_text = _first_text(tree, _SEL_STATION)
+        if station_text is not None:
+            data['nearest_station'] = station_text
+            
+            # 徒歩時間を抽出
+            walk_match = _RE_WALK.search(station_text)
+            if walk_match:
+                data['walk_time'] = f"徒歩{walk_match.group(1)}分"
+                data['walk_minutes'] = int(walk_match.group(1))
+        
+        # 建ぺい率・容積率
+        coverage_text = _first_text(tree, _SEL_COVERAGE)
+        if coverage_text is not None:
+            coverage_match = _RE_PCT.search(coverage_text)
+            if coverage_match:
+                data['building_coverage'] = float(coverage_match.group(1))
+        
+        ratio_text = _first_text(tree, _SEL_RATIO)
+        if ratio_text is not None:
+            ratio_match = _RE_PCT.search(ratio_text)
+            if ratio_match:
+                data['floor_area_ratio'] = float(ratio_match.group(1))
+        
+        # 用途地域
+        data['usage_area'] = _first_text(tree, _SEL_USAGE) or ''
+        
+        # 画像URL
+        image_urls = []
+        for img in _SEL_IMAGES(tree):
+            img_url = img.get('src') or img.get('data-src')
+            if img_url:
+                image_urls.append(urljoin(self.base_url, img_url))
+        data['image_urls'] = image_urls[:5]  # 最大5枚
+        
+        # 生データを保存（デバッグ用）
+        data['raw_data'] = {
+            'title': data.get('title'),
+            'price': data.get('price'),
+            'address': data.get('address')
+        }
+        
+        return data
@@ -0,0 +1,63 @@
+"""
+pytest共通設定
+テスト用のデータベースと設定を用意
+"""
+import sys
+import dataclasses
+from pathlib import Path
+from types import MappingProxyType
+
+import pytest
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config.athome_scraper_config import CONFIG
+from src.database import PropertyDatabase
+
+# デモ用スクリプト（pytestのテストではないため収集しない）
+collect_ignore = ['test_demo.py']
+
+
+@pytest.fixture
+def config(tmp_path):
+    """一時ディレクトリのデータベースを使い、リクエスト間隔を0にした設定"""
+    return dataclasses.replace(
+        CONFIG,
+        scraping=MappingProxyType({**CONFIG.scraping, 'request_delay': 0}),
+        database=MappingProxyType({**CONFIG.database, 'db_path': tmp_path / 'properties.db'}),
+    )
+
+
+@pytest.fixture
+def db(config):
+    """テスト用のデータベース"""
+    database = PropertyDatabase(config.database['db_path'])
+    yield database
+    database.close()
+
+
+def make_property(property_id: str, **overrides) -> dict:
+    """
+    テスト用の物件データを作成
+    
+    Args:
+        property_id: 物件ID
+        **overrides: 上書きする項目
+    
+    Returns:
+        物件データの辞書
+    """
+    data = {
+        'property_id': property_id,
+        'url': f'https://www.athome.co.jp/kodate/{property_id}/',
+        'title': f'大分市中央町 売土地 {property_id}',
+        'price': '1,000万円',
+        'price_numeric': 1000,
+        'address': '大分県大分市中央町1-2-3',
+        'land_area_tsubo': 100,
+        'walk_minutes': 5,
+        'image_urls': ['https://example.com/1.jpg'],
+    }
+    data.update(overrides)
+    return data
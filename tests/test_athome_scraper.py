@@ -0,0 +1,139 @@
+"""
+HTTP版スクレイパーのテスト
+物件詳細の条件付きリクエスト（304応答・内容が同一の場合のキャッシュ利用）と項目の抽出を確認
+"""
+import pytest
+
+from src.athome_scraper import AthomeScraper
+
+URL = 'https://www.athome.co.jp/kodate/1234567890/'
+
+DETAIL_HTML = """
+<html><body>
+  <h1>大分市中央町 売土地 100坪</h1>
+  <div class="price">1,000万円</div>
+  <div class="address">大分県大分市中央町1-2-3</div>
+  <div class="land-area">330.58㎡（100坪）</div>
+  <div class="station">大分駅 徒歩5分</div>
+</body></html>
+""".encode('utf-8')
+
+
+class FakeResponse:
+    """session.get の戻り値の代わり（with文で使う部分のみ）"""
+    
+    def __init__(self, status_code: int, content: bytes = b'', headers: dict = None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {'Content-Type': 'text/html; charset=utf-8', **(headers or {})}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+    
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def scraper(config):
+    scraper = AthomeScraper(config)
+    yield scraper
+    scraper.db.close()
+
+
+@pytest.fixture
+def responses(scraper, monkeypatch):
+    """session.get が返す応答のキューと、送信したリクエストヘッダーの記録"""
+    queue, sent_headers = [], []
+    
+    def fake_get(url, headers=None, **kwargs):
+        sent_headers.append(headers or {})
+        return queue.pop(0)
+    
+    monkeypatch.setattr(scraper.session, 'get', fake_get)
+    return queue, sent_headers
+
+
+def test_first_fetch_stores_validators(scraper, responses):
+    """初回は条件なしで取得し、ETag・Last-Modified・本文のハッシュを記録する"""
+    queue, sent_headers = responses
+    queue.append(FakeResponse(200, DETAIL_HTML, {'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}))
+    
+    data = scraper._scrape_property_detail(URL)
+    
+    assert sent_headers == [{}]
+    assert data['property_id'] == 'athome_1234567890'
+    assert data['title'] == '大分市中央町 売土地 100坪'
+    assert data['price_numeric'] == 1000
+    assert data['walk_minutes'] == 5
+    assert data['etag'] == '"v1"'
+    assert data['last_modified'] == 'Mon, 01 Jan 2024 00:00:00 GMT'
+    assert data['content_hash']
+
+
+def test_not_modified_restores_cached_detail(scraper, responses):
+    """304応答の場合は前回の検証子で問い合わせ、DBの内容を復元する"""
+    queue, sent_headers = responses
+    queue.append(FakeResponse(200, DETAIL_HTML, {'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}))
+    scraper.db.upsert_property(scraper._scrape_property_detail(URL))
+    
+    queue.append(FakeResponse(304))
+    data = scraper._scrape_property_detail(URL)
+    
+    assert sent_headers[1] == {
+        'If-None-Match': '"v1"',
+        'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT',
+    }
+    assert data['title'] == '大分市中央町 売土地 100坪'
+    assert data['price_numeric'] == 1000
+    assert data['etag'] == '"v1"'
+
+
+def test_same_content_updates_validators(scraper, responses):
+    """本文が前回と同一ならパースを省略し、検証子は新しい応答の値に更新する"""
+    queue, _ = responses
+    queue.append(FakeResponse(200, DETAIL_HTML, {'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}))
+    scraper.db.upsert_property(scraper._scrape_property_detail(URL))
+    
+    queue.append(FakeResponse(200, DETAIL_HTML, {'ETag': '"v2"'}))
+    data = scraper._scrape_property_detail(URL)
+    
+    assert data['title'] == '大分市中央町 売土地 100坪'
+    assert data['etag'] == '"v2"'
+    assert data['last_modified'] is None
+    
+    scraper.db.upsert_property(data)
+    saved = scraper.db.get_property('athome_1234567890')
+    assert saved['etag'] == '"v2"'
+    assert saved['last_modified'] is None
+
+
+def test_non_html_response_is_skipped(scraper, responses):
+    """HTML以外の応答は物件データにしない"""
+    queue, _ = responses
+    queue.append(FakeResponse(200, b'%PDF', {'Content-Type': 'application/pdf'}))
+    
+    assert scraper._scrape_property_detail(URL) is None
+
+
+def test_exact_class_selectors_do_not_match_longer_class_names(scraper, responses):
+    """.property-title 等のクラス指定は完全一致で判定し、クラス名の一部が一致するだけの要素は採用しない"""
+    queue, _ = responses
+    queue.append(FakeResponse(200, """
+        <html><body>
+          <div class="property-title-sub">おすすめ物件</div>
+          <div class="kakaku-note">価格は税込です</div>
+          <h1>大分市中央町 売土地 100坪</h1>
+          <div class="kakaku">1,000万円</div>
+          <div class="jusho">大分県大分市中央町1-2-3</div>
+        </body></html>
+    """.encode('utf-8')))
+    
+    data = scraper._scrape_property_detail(URL)
+    
+    assert data['title'] == '大分市中央町 売土地 100坪'
+    assert data['price'] == '1,000万円'
+    assert data['address'] == '大分県大分市中央町1-2-3'
@@ -0,0 +1,49 @@
+"""
+物件データ一括保存のテスト
+保存できない物件の切り分け・取得エラーの集計を確認
+"""
+from conftest import make_property
+from src.batch_saver import BatchSaver, fetch_and_save
+from src.ranking import PropertyRanker
+
+
+def _stats():
+    return {'total_properties': 0, 'new_properties': 0, 'updated_properties': 0, 'errors': 0}
+
+
+def test_failed_row_is_isolated_from_batch(db, config):
+    """保存できない物件のみをエラーとして除外し、同じバッチの他の物件は保存する"""
+    stats = _stats()
+    saver = BatchSaver(db, PropertyRanker(config), stats, batch_size=10)
+    
+    for property_data in (
+        make_property('athome_1'),
+        make_property('athome_2'),
+        {'property_id': 'athome_3', 'url': 'https://www.athome.co.jp/kodate/athome_3/'},  # 必須カラム不足
+        make_property('athome_4'),
+    ):
+        saver.add(property_data)
+    saver.flush()
+    
+    assert saver.active_property_ids == ['athome_1', 'athome_2', 'athome_4']
+    assert stats == {'total_properties': 3, 'new_properties': 3, 'updated_properties': 0, 'errors': 1}
+    assert db.get_property('athome_3') is None
+
+
+def test_fetch_and_save_counts_fetch_errors(db, config):
+    """取得中の例外はエラーとして数え、残りの物件の保存を続ける"""
+    stats = _stats()
+    saver = BatchSaver(db, PropertyRanker(config), stats, batch_size=2, active_property_ids=['athome_0'])
+    
+    def fetch(url):
+        property_id = url.rstrip('/').rsplit('/', 1)[1]
+        if property_id == 'athome_2':
+            raise RuntimeError('取得失敗')
+        return None if property_id == 'athome_3' else make_property(property_id)
+    
+    urls = [make_property(f'athome_{i}')['url'] for i in (1, 2, 3, 4, 5)]
+    fetch_and_save(fetch, urls, saver, max_workers=2)
+    
+    assert sorted(saver.active_property_ids) == ['athome_0', 'athome_1', 'athome_4', 'athome_5']
+    assert stats['total_properties'] == 3
+    assert stats['errors'] == 1
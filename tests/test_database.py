@@ -0,0 +1,191 @@
+"""
+データベースのテスト
+UPSERT・部分更新・JSONカラムの型・日時の移行・再取得判定・CSV出力を確認
+"""
+import csv
+import sqlite3
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from conftest import make_property
+from src.database import PropertyDatabase
+
+
+def _raw(db_path, query, params=()):
+    """別接続で直接SQLを実行して結果を取得"""
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(query, params).fetchall()
+
+
+def test_upsert_new_and_update(db):
+    """新規は (True, id)、登録済みは (False, id) を返し、内容を更新する"""
+    assert db.upsert_property(make_property('athome_1')) == (True, 'athome_1')
+    assert db.upsert_property(make_property('athome_1', price='900万円')) == (False, 'athome_1')
+    
+    saved = db.get_property('athome_1')
+    assert saved['price'] == '900万円'
+    assert saved['image_urls'] == ['https://example.com/1.jpg']
+
+
+def test_upsert_batch_with_duplicate_ids(db):
+    """同じバッチ内で同じ物件が2回現れた場合は2回目を更新として扱う"""
+    results = db.upsert_properties_batch([
+        make_property('athome_1'),
+        make_property('athome_2'),
+        make_property('athome_1', title='更新後'),
+    ])
+    
+    assert results == [(True, 'athome_1'), (True, 'athome_2'), (False, 'athome_1')]
+    assert db.get_property('athome_1')['title'] == '更新後'
+
+
+def test_upsert_batch_keeps_input_order_for_same_property(db):
+    """同じ物件のカラム構成が異なる行が交互に並んでも、最後の行の値が残る"""
+    results = db.upsert_properties_batch([
+        make_property('athome_1', price='v1'),
+        make_property('athome_1', price='v2', land_area='100坪'),
+        make_property('athome_1', price='v3'),
+    ])
+    
+    assert results == [(True, 'athome_1'), (False, 'athome_1'), (False, 'athome_1')]
+    saved = db.get_property('athome_1')
+    assert saved['price'] == 'v3'
+    assert saved['land_area'] == '100坪'
+
+
+def test_partial_update_after_insert_in_same_batch(db):
+    """同じバッチで追加した物件への部分的なデータはUPDATEとして反映する"""
+    db.upsert_properties_batch([
+        make_property('athome_1'),
+        {'property_id': 'athome_1', 'price': '800万円'},
+    ])
+    
+    assert db.get_property('athome_1')['price'] == '800万円'
+
+
+def test_partial_update_of_existing_property(db):
+    """登録済みの物件は必須カラムを含まない部分的なデータでも指定カラムのみ更新する"""
+    db.upsert_property(make_property('athome_1'))
+    
+    assert db.upsert_property({'property_id': 'athome_1', 'price': '800万円'}) == (False, 'athome_1')
+    
+    saved = db.get_property('athome_1')
+    assert saved['price'] == '800万円'
+    assert saved['title'] == '大分市中央町 売土地 athome_1'
+    assert saved['url'] == 'https://www.athome.co.jp/kodate/athome_1/'
+
+
+def test_partial_data_for_new_property_fails(db):
+    """未登録の物件で必須カラムが無い場合はエラーになり、何も保存しない"""
+    with pytest.raises(sqlite3.IntegrityError):
+        db.upsert_properties_batch([
+            make_property('athome_1'),
+            {'property_id': 'athome_2', 'price': '800万円'},
+        ])
+    
+    assert db.get_property('athome_1') is None
+
+
+def test_json_columns_stored_as_text(db):
+    """リスト・辞書はJSON文字列（TEXT）として保存する"""
+    db.upsert_property(make_property('athome_1', raw_data={'texts': {'price': '1,000万円'}}))
+    
+    rows = _raw(db.db_path, """
+        SELECT typeof(image_urls), typeof(raw_data), json_extract(raw_data, '$.texts.price')
+        FROM properties WHERE property_id = 'athome_1'
+    """)
+    assert rows == [('text', 'text', '1,000万円')]
+    assert db.get_property('athome_1')['raw_data'] == {'texts': {'price': '1,000万円'}}
+
+
+def test_migrates_legacy_timestamps(db):
+    """user_version が古いデータベースは文字列の日時をUNIX時刻に変換する"""
+    db.upsert_properties_batch([make_property('athome_1'), make_property('athome_2')])
+    db.close()
+    
+    with sqlite3.connect(db.db_path) as conn:
+        conn.execute("""
+            UPDATE properties SET scraped_at = '2024-01-02 03:04:05',
+                updated_at = '2024-01-02T03:04:05.123456'
+            WHERE property_id = 'athome_1'
+        """)
+        conn.execute("PRAGMA user_version = 0")
+    
+    PropertyDatabase(db.db_path).close()
+    
+    # CURRENT_TIMESTAMP の値はUTC、マイクロ秒付きはPython側のローカル時刻
+    assert _raw(db.db_path, """
+        SELECT scraped_at, updated_at FROM properties WHERE property_id = 'athome_1'
+    """) == [(
+        int(datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc).timestamp()),
+        int(datetime(2024, 1, 2, 3, 4, 5, 123456).timestamp()),
+    )]
+    assert _raw(db.db_path, "PRAGMA user_version") == [(1,)]
+
+
+def test_migration_runs_only_once(db):
+    """移行済み（user_version が最新）のデータベースは再度変換しない"""
+    db.upsert_property(make_property('athome_1'))
+    db.close()
+    
+    with sqlite3.connect(db.db_path) as conn:
+        conn.execute("UPDATE properties SET scraped_at = '2024-01-02 03:04:05'")
+    
+    PropertyDatabase(db.db_path).close()
+    
+    assert _raw(db.db_path, "SELECT typeof(scraped_at) FROM properties") == [('text',)]
+
+
+def test_get_recent_urls_respects_ttl(db):
+    """指定時間内に取得したアクティブな物件のURLのみ返す"""
+    now = int(time.time())
+    db.upsert_properties_batch([
+        make_property('athome_1', scraped_at=now),
+        make_property('athome_2', scraped_at=now - 48 * 3600),
+        make_property('athome_3', scraped_at=now),
+    ])
+    db.deactivate_old_properties(['athome_1', 'athome_2'])
+    urls = [make_property(f'athome_{i}')['url'] for i in (1, 2, 3, 4)]
+    
+    assert db.get_recent_urls(urls, 24) == {urls[0]: 'athome_1'}
+    assert db.get_recent_urls(urls, 72) == {urls[0]: 'athome_1', urls[1]: 'athome_2'}
+    assert db.get_recent_urls(urls, 0) == {}
+    assert db.get_recent_urls([], 24) == {}
+
+
+def test_export_to_csv_in_ranking_order(db, tmp_path):
+    """ランクスコアの降順で出力し、ランクフィルターを適用する"""
+    db.upsert_properties_batch([
+        make_property('athome_1', ranking_score=65.0, ranking_grade='C', scraped_at=0),
+        make_property('athome_2', ranking_score=92.5, ranking_grade='S', scraped_at=0),
+        make_property('athome_3', ranking_score=81.0, ranking_grade='A', scraped_at=0),
+    ])
+    output_path = tmp_path / 'exports' / 'properties.csv'
+    
+    db.export_to_csv(output_path)
+    with open(output_path, encoding='utf-8-sig', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['property_id'] for row in rows] == ['athome_2', 'athome_3', 'athome_1']
+    assert rows[0]['scraped_at'] == datetime.fromtimestamp(0).strftime('%Y-%m-%d %H:%M:%S')
+    
+    db.export_to_csv(output_path, rank_filter=['S', 'A'])
+    with open(output_path, encoding='utf-8-sig', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['property_id'] for row in rows] == ['athome_2', 'athome_3']
+
+
+def test_export_to_csv_streams_all_rows(db, tmp_path):
+    """書き出しの単位（1000行）を超える件数も全行出力する"""
+    db.upsert_properties_batch([
+        make_property(f'athome_{i}', ranking_score=float(i % 100)) for i in range(2500)
+    ])
+    output_path = tmp_path / 'properties.csv'
+    
+    db.export_to_csv(output_path)
+    
+    with open(output_path, encoding='utf-8-sig', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 2500
+    assert len({row['property_id'] for row in rows}) == 2500
@@ -77,9 +77,9 @@ def test_database():
         }
     ]
     
-    # 物件を追加
-    for prop in sample_properties:
-        is_new, prop_id = db.upsert_property(prop)
+    # 物件を1トランザクションで一括追加
+    results = db.upsert_properties_batch(sample_properties)
+    for prop, (is_new, prop_id) in zip(sample_properties, results):
         status = "新規追加" if is_new else "更新"
         print(f"  {status}: {prop['title']}")
     
@@ -94,26 +94,21 @@ def test_ranking(db, sample_properties):
     print("="*60)
     
     # ランカーを初期化
-    config = {
-        'RANK_THRESHOLDS': RANK_THRESHOLDS,
-        'RANKING_WEIGHTS': RANKING_WEIGHTS,
-        'PRICE_CRITERIA': PRICE_CRITERIA,
-        'PREMIUM_AREAS': PREMIUM_AREAS,
-        'STATION_DISTANCE_CRITERIA': STATION_DISTANCE_CRITERIA,
-        'AREA_CRITERIA': AREA_CRITERIA,
-        'INVESTMENT_CRITERIA': INVESTMENT_CRITERIA,
-    }
-    ranker = PropertyRanker(config)
+    ranker = PropertyRanker(CONFIG)
+    
+    # 全物件をまとめてランク付けし、結果を一括更新
+    rank_infos = ranker.calculate_ranks(sample_properties)
+    db.update_rankings(
+        (info['ranking_score'], info['ranking_grade'], info['price_evaluation'],
+         info['location_evaluation'], info['area_evaluation'], info['investment_evaluation'],
+         prop['property_id'])
+        for prop, info in zip(sample_properties, rank_infos)
+    )
     
-    # 各物件をランク付け
     print("\n【ランク付け結果】")
-    for prop in sample_properties:
-        rank_info = ranker.calculate_rank(prop)
+    for prop, rank_info in zip(sample_properties, rank_infos):
         prop.update(rank_info)
         
-        # データベースを更新
-        db.upsert_property(prop)
-        
         # 結果を表示
         print(f"\n物件: {prop['title']}")
         print(f"  住所: {prop['address']}")
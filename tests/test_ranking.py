@@ -0,0 +1,67 @@
+"""
+ランク付けのテスト
+一括計算（calculate_ranks）が1件ずつの計算（calculate_rank）と同じ結果になることを確認
+"""
+import random
+
+import pytest
+
+from src.ranking import PropertyRanker
+
+
+@pytest.fixture
+def ranker(config):
+    return PropertyRanker(config)
+
+
+def _random_property(rng: random.Random, index: int) -> dict:
+    """数値・境界値・欠損・数値以外の値を混ぜた物件データ"""
+    data = {
+        'property_id': f'athome_{index}',
+        'price_numeric': rng.choice([0, 500, 1000, rng.uniform(100, 20000), None, '1,200万円']),
+        'land_area_tsubo': rng.choice([0, 20, 30, 50, 100, rng.uniform(1, 200), None, '100坪']),
+        'walk_minutes': rng.choice([None, 0, 5, 10, 15, rng.randint(0, 30), '5']),
+        'address': rng.choice(['大分県大分市中央町1-2-3', '大分県大分市萩原', '大分県別府市', '', None]),
+        'building_coverage': rng.choice([0, 30, 50, 60, 80, 55.5, None, '60%']),
+        'floor_area_ratio': rng.choice([0, 100, 200, 300, 400, 500, None, True]),
+        'usage_area': rng.choice(['', '商業地域', '近隣商業地域', '第一種低層住居専用地域', None]),
+    }
+    # 項目自体が無い物件も混ぜる
+    for field in ('price_numeric', 'walk_minutes', 'address', 'usage_area'):
+        if rng.random() < 0.1:
+            del data[field]
+    return data
+
+
+def test_calculate_ranks_matches_calculate_rank(ranker):
+    """一括計算と1件ずつの計算の結果が一致する"""
+    rng = random.Random(0)
+    rows = [_random_property(rng, i) for i in range(2000)]
+    
+    assert ranker.calculate_ranks(rows) == [ranker.calculate_rank(row) for row in rows]
+
+
+@pytest.mark.parametrize('price, tsubo', [(1000, 100), (1500, 100), (2000, 100), (2500, 100), (3000, 100)])
+def test_calculate_ranks_matches_on_price_thresholds(ranker, price, tsubo):
+    """坪単価が評価基準の閾値ちょうどの場合も一致する"""
+    row = {'price_numeric': price, 'land_area_tsubo': tsubo, 'walk_minutes': 5}
+    
+    assert ranker.calculate_ranks([row]) == [ranker.calculate_rank(row)]
+
+
+def test_calculate_ranks_keeps_order(ranker):
+    """一括計算の対象と1件ずつ計算する物件が混在しても入力順で返す"""
+    rows = [
+        {'property_id': 'a', 'price_numeric': 1000, 'land_area_tsubo': 100},
+        {'property_id': 'b', 'price_numeric': '1,000万円', 'land_area_tsubo': 100},
+        {'property_id': 'c', 'price_numeric': 5000, 'land_area_tsubo': 50},
+    ]
+    
+    results = ranker.calculate_ranks(rows)
+    
+    assert len(results) == 3
+    assert results == [ranker.calculate_rank(row) for row in rows]
+
+
+def test_calculate_ranks_empty(ranker):
+    assert ranker.calculate_ranks([]) == []
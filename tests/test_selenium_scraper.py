@@ -0,0 +1,287 @@
+"""
+Selenium版スクレイパーのテスト
+物件詳細のHTTP取得（文字コード・CAPTCHA判定・ブラウザへの切り替え）・一覧ページの物件URL収集・取得済み物件のスキップを確認
+"""
+import time
+
+import pytest
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from conftest import make_property
+from src import selenium_scraper
+from src.selenium_scraper import _COLLECT_HREFS_JS, SeleniumAthomeScraper
+
+URL = 'https://www.athome.co.jp/kodate/1234567890/'
+
+DETAIL_HTML = """
+<html><head>{head}</head><body>
+  <h1>大分市中央町 売土地 100坪</h1>
+  <div class="price">1,000万円</div>
+  <div class="address">大分県大分市中央町1-2-3</div>
+  <div class="land-area">330.58㎡（100坪）</div>
+  <div class="station">大分駅 徒歩5分</div>
+  {body}
+</body></html>
+"""
+
+CAPTCHA_HTML = '<html><body><p>認証にご協力ください。</p></body></html>'
+
+RECAPTCHA_TAGS = (
+    '<script src="https://www.google.com/recaptcha/api.js" async defer></script>'
+    '<script>grecaptcha.ready(function() {});</script>'
+)
+
+
+def detail_html(head: str = '', body: str = '') -> str:
+    return DETAIL_HTML.format(head=head, body=body)
+
+
+class FakeResponse:
+    """session.get の戻り値の代わり"""
+    
+    def __init__(self, status_code: int, content: bytes, content_type: str = 'text/html'):
+        self.status_code = status_code
+        self.content = content
+        self.headers = CaseInsensitiveDict({'Content-Type': content_type})
+        self.encoding = get_encoding_from_headers(self.headers)
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeDriver:
+    """物件詳細のブラウザ取得で使うWebDriverの代わり"""
+    
+    def __init__(self, page_source: str):
+        self.page_source = page_source
+        self.visited = []
+    
+    def get(self, url):
+        self.visited.append(url)
+    
+    def find_element(self, by, value):
+        return object()
+    
+    def get_cookies(self):
+        return []
+
+
+class FakeNextButton:
+    """次ページボタンの代わり"""
+    
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+    
+    def is_enabled(self):
+        return self.enabled
+
+
+class FakeListingDriver:
+    """一覧ページの巡回で使うWebDriverの代わり（ページごとの物件リンクを返す）"""
+    
+    def __init__(self, pages: list, page_sources: list = None):
+        self.pages = pages
+        self.page_sources = page_sources or ['<html><body></body></html>'] * len(pages)
+        self.visited = []
+        self.scripts = []
+        self.page = 0
+    
+    def get(self, url):
+        self.visited.append(url)
+        if '?page=' in url:
+            self.page = int(url.rsplit('=', 1)[1]) - 1
+    
+    @property
+    def page_source(self):
+        return self.page_sources[self.page]
+    
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+        if script == _COLLECT_HREFS_JS:
+            return self.pages[self.page]
+        if 'readyState' in script:
+            return True if 'querySelector' in script else 'complete'
+        return None
+    
+    def find_element(self, by, value):
+        return FakeNextButton(self.page < len(self.pages) - 1)
+
+
+@pytest.fixture
+def scraper(config, monkeypatch):
+    # テストのプロセスにSIGTERMハンドラーを登録しない
+    monkeypatch.setattr(selenium_scraper, '_SIGTERM_HANDLER_INSTALLED', True)
+    scraper = SeleniumAthomeScraper(config)
+    yield scraper
+    if 'db' in scraper.__dict__:
+        scraper.db.close()
+
+
+@pytest.fixture
+def browser_fallback(scraper, monkeypatch):
+    """ブラウザでの再取得に回されたURLの記録"""
+    fallback_urls = []
+    
+    def fake_selenium(url):
+        fallback_urls.append(url)
+        return None
+    
+    monkeypatch.setattr(scraper, '_scrape_property_detail_selenium', fake_selenium)
+    return fallback_urls
+
+
+def serve(scraper, monkeypatch, response: FakeResponse):
+    monkeypatch.setattr(scraper.session, 'get', lambda url, **kwargs: response)
+
+
+def test_detail_without_charset_is_decoded_as_utf8(scraper, browser_fallback, monkeypatch):
+    """charsetのないtext/htmlでもISO-8859-1として文字化けさせない"""
+    serve(scraper, monkeypatch, FakeResponse(200, detail_html().encode('utf-8')))
+    
+    data = scraper._scrape_property_detail(URL)
+    
+    assert browser_fallback == []
+    assert data['title'] == '大分市中央町 売土地 100坪'
+    assert data['price_numeric'] == 1000
+    assert data['walk_minutes'] == 5
+
+
+def test_detail_uses_meta_charset(scraper, browser_fallback, monkeypatch):
+    """Content-Typeにcharsetがなければmeta要素の宣言に従う"""
+    head = '<meta http-equiv="Content-Type" content="text/html; charset=Shift_JIS">'
+    html = detail_html(head).replace('㎡', 'm2')  # ㎡はShift_JISにない
+    serve(scraper, monkeypatch, FakeResponse(200, html.encode('shift_jis')))
+    
+    assert scraper._scrape_property_detail(URL)['address'] == '大分県大分市中央町1-2-3'
+
+
+def test_detail_uses_header_charset(scraper, browser_fallback, monkeypatch):
+    """Content-Typeのcharsetを優先する"""
+    html = detail_html().replace('㎡', 'm2')  # ㎡はEUC-JPにない
+    serve(scraper, monkeypatch, FakeResponse(200, html.encode('euc_jp'), 'text/html; charset=EUC-JP'))
+    
+    assert scraper._scrape_property_detail(URL)['title'] == '大分市中央町 売土地 100坪'
+
+
+def test_detail_with_recaptcha_script_is_not_captcha(scraper, browser_fallback, monkeypatch):
+    """reCAPTCHAのスクリプトを含む通常の物件ページはブラウザに回さない"""
+    serve(scraper, monkeypatch, FakeResponse(200, detail_html(RECAPTCHA_TAGS).encode('utf-8')))
+    
+    data = scraper._scrape_property_detail(URL)
+    
+    assert browser_fallback == []
+    assert data['title'] == '大分市中央町 売土地 100坪'
+
+
+@pytest.mark.parametrize('response', [
+    FakeResponse(200, CAPTCHA_HTML.encode('utf-8')),
+    FakeResponse(403, b'Forbidden'),
+    FakeResponse(429, b'Too Many Requests'),
+])
+def test_blocked_detail_falls_back_to_browser(scraper, browser_fallback, monkeypatch, response):
+    """CAPTCHAページやブロック時の応答はブラウザで取得し直す"""
+    serve(scraper, monkeypatch, response)
+    
+    assert scraper._scrape_property_detail(URL) is None
+    assert browser_fallback == [URL]
+
+
+def test_browser_fallback_skips_captcha(scraper):
+    """ブラウザでもCAPTCHAが表示された場合は物件データにしない"""
+    scraper.driver = FakeDriver(CAPTCHA_HTML)
+    
+    assert scraper._scrape_property_detail_selenium(URL) is None
+    assert scraper.driver.visited == [URL]
+
+
+def test_browser_fallback_parses_page_with_recaptcha(scraper):
+    """ブラウザで取得したページもreCAPTCHAのスクリプトだけではCAPTCHAとみなさない"""
+    scraper.driver = FakeDriver(detail_html(RECAPTCHA_TAGS))
+    
+    data = scraper._scrape_property_detail_selenium(URL)
+    
+    assert data['property_id'] == 'athome_1234567890'
+    assert data['title'] == '大分市中央町 売土地 100坪'
+
+
+@pytest.fixture
+def listing(scraper, monkeypatch):
+    """一覧ページの巡回でスクロール後の待機を省略する"""
+    monkeypatch.setattr(selenium_scraper.random, 'uniform', lambda a, b: 0)
+    return scraper
+
+
+def test_property_urls_deduplicated_in_page_order(listing):
+    """ページをまたいで重複した物件URLは1件にまとめ、最初に現れた順を保つ"""
+    listing.driver = FakeListingDriver([
+        ['https://www.athome.co.jp/kodate/3/', 'https://www.athome.co.jp/kodate/1/'],
+        ['https://www.athome.co.jp/kodate/1/', 'https://www.athome.co.jp/kodate/2/'],
+    ])
+    
+    assert listing._get_property_urls() == [
+        'https://www.athome.co.jp/kodate/3/',
+        'https://www.athome.co.jp/kodate/1/',
+        'https://www.athome.co.jp/kodate/2/',
+    ]
+    assert listing.driver.visited[-1] == f'{listing.search_url}?page=2'
+
+
+def test_property_urls_collected_in_one_script_per_page(listing):
+    """物件リンクのURLはページごとに1回のスクリプト実行でまとめて取得する"""
+    hrefs = [f'https://www.athome.co.jp/kodate/{i}/' for i in range(30)]
+    listing.driver = FakeListingDriver([hrefs])
+    
+    assert listing._get_property_urls() == hrefs
+    assert listing.driver.scripts.count(_COLLECT_HREFS_JS) == 1
+
+
+def test_property_urls_fall_back_to_page_source(listing):
+    """スクリプトで物件リンクが取れない場合は、ページソースから物件らしいリンクのみ拾う"""
+    listing.driver = FakeListingDriver([[]], ['''
+        <html><body>
+          <a href="/kodate/111/">戸建</a>
+          <a href="/tochi/222/">土地</a>
+          <a href="/company/">会社概要</a>
+          <a href="/bukken/333/">物件</a>
+          <a href="/detail/444/">詳細</a>
+        </body></html>
+    '''])
+    
+    assert listing._get_property_urls() == [
+        'https://www.athome.co.jp/kodate/111/',
+        'https://www.athome.co.jp/tochi/222/',
+        'https://www.athome.co.jp/bukken/333/',
+        'https://www.athome.co.jp/detail/444/',
+    ]
+
+
+def test_scrape_all_skips_recently_scraped(scraper, monkeypatch):
+    """最近取得した物件は詳細を取得せず、アクティブなまま残す"""
+    now = int(time.time())
+    scraper.db.upsert_properties_batch([
+        make_property('athome_1', scraped_at=now),
+        make_property('athome_2', scraped_at=now - 48 * 3600),
+        make_property('athome_3', scraped_at=now),
+    ])
+    urls = [make_property(f'athome_{i}')['url'] for i in (1, 2)]
+    fetched = []
+    
+    def fake_detail(url):
+        fetched.append(url)
+        return make_property(url.rstrip('/').rsplit('/', 1)[1])
+    
+    for name in ('_init_driver', '_set_resource_blocking', '_sync_session_cookies', '_close_driver'):
+        monkeypatch.setattr(scraper, name, lambda *args: None)
+    monkeypatch.setattr(scraper, '_get_property_urls', lambda: urls)
+    monkeypatch.setattr(scraper, '_scrape_property_detail', fake_detail)
+    
+    stats = scraper.scrape_all()
+    
+    assert fetched == [urls[1]]
+    assert stats['skipped_properties'] == 1
+    assert stats['updated_properties'] == 1
+    assert scraper.db.get_property('athome_1')['is_active']
+    assert scraper.db.get_property('athome_2')['is_active']
+    assert not scraper.db.get_property('athome_3')['is_active']